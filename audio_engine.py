@@ -0,0 +1,324 @@
+import threading
+import time
+import wave
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from audio_features import StreamingMfcc
+from vad import VoiceActivityDetector
+
+try:
+    import sounddevice
+except ImportError:  # Microphone input is optional; WAV files always work
+    sounddevice = None
+
+SAMPLE_RATE = 16000
+# Samples read from the input per chunk (32 ms at 16 kHz)
+CHUNK_SIZE = 512
+
+
+class AudioSource:
+    """Base class for anything that produces mono float32 audio chunks"""
+
+    sample_rate = SAMPLE_RATE
+    # Why the last open() failed, for the user
+    error = "Audio input could not be opened"
+
+    def open(self):
+        """Prepare the source; return True on success"""
+        return True
+
+    def read(self, out):
+        """Fill out with the next samples; return how many were written (0 at the end)"""
+        raise NotImplementedError
+
+    def close(self):
+        """Free any resources held by the source"""
+
+    def describe(self):
+        """Short human-readable name for reports"""
+        return type(self).__name__
+
+
+class MicrophoneSource(AudioSource):
+    """Default input device, read through sounddevice when it is installed"""
+    def __init__(self, device=None, sample_rate=SAMPLE_RATE):
+        self.device = device
+        self.sample_rate = sample_rate
+        self.stream = None
+
+    def open(self):
+        if sounddevice is None:
+            self.error = "Microphone input needs the sounddevice package (pip install sounddevice)"
+            return False
+        try:
+            self.stream = sounddevice.InputStream(device=self.device, channels=1,
+                                                  samplerate=self.sample_rate, dtype="float32",
+                                                  blocksize=CHUNK_SIZE)
+            self.stream.start()
+        except Exception:
+            # PortAudio reports a missing or busy device in many different ways
+            self.stream = None
+            self.error = "No microphone available"
+            return False
+        return True
+
+    def read(self, out):
+        if self.stream is None:
+            return 0
+        data, _ = self.stream.read(len(out))
+        out[:len(data)] = data[:, 0]
+        return len(data)
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+
+    def describe(self):
+        return "microphone" if self.device is None else f"microphone {self.device}"
+
+
+class WavFileSource(AudioSource):
+    """16-bit PCM WAV file, mixed down to mono
+
+    With realtime set, chunks are paced at the file's sample rate so the file
+    behaves like a microphone; otherwise they are delivered as fast as they
+    are decoded. With loop set, playback restarts at the end of the file.
+    """
+    def __init__(self, path, loop=False, realtime=True):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.reader = None
+        self.channels = 1
+        self.next_time = 0.0
+
+    def open(self):
+        try:
+            self.reader = wave.open(self.path, "rb")
+        except (OSError, wave.Error, EOFError):
+            self.error = f"Could not open {self.path}"
+            return False
+        if self.reader.getsampwidth() != 2:
+            self.close()
+            self.error = f"{self.path} is not a 16-bit PCM WAV file"
+            return False
+        self.channels = self.reader.getnchannels()
+        self.sample_rate = self.reader.getframerate()
+        self.next_time = time.monotonic()
+        return True
+
+    def read(self, out):
+        if self.reader is None:
+            return 0
+        raw = self.reader.readframes(len(out))
+        if not raw and self.loop:
+            self.reader.rewind()
+            raw = self.reader.readframes(len(out))
+        samples = np.frombuffer(raw, np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        count = len(samples)
+        out[:count] = samples * (1.0 / 32768)
+
+        if self.realtime and count:
+            self.next_time += count / self.sample_rate
+            delay = self.next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return count
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def describe(self):
+        return f"file {self.path}"
+
+
+def make_audio_source(device=None):
+    """Return an AudioSource for a WAV path, an input device (None: default) or a source"""
+    if isinstance(device, AudioSource):
+        return device
+    if isinstance(device, str):
+        return WavFileSource(device)
+    return MicrophoneSource(device)
+
+
+class AudioRing:
+    """Preallocated ring buffer holding the most recent samples"""
+    def __init__(self, size):
+        self.data = np.zeros(size, np.float32)
+        self.size = size
+        self.index = 0
+        self.written = 0
+
+    def write(self, samples):
+        """Append samples, overwriting the oldest"""
+        count = len(samples)
+        if count >= self.size:
+            self.data[:] = samples[-self.size:]
+            self.index = 0
+        else:
+            end = self.index + count
+            if end <= self.size:
+                self.data[self.index:end] = samples
+            else:
+                split = self.size - self.index
+                self.data[self.index:] = samples[:split]
+                self.data[:end - self.size] = samples[split:]
+            self.index = end % self.size
+        self.written += count
+
+    def latest(self, out):
+        """Copy the newest len(out) samples into out, oldest first"""
+        count = len(out)
+        start = self.index - count
+        if start >= 0:
+            out[:] = self.data[start:self.index]
+        else:
+            out[:-start] = self.data[start:]
+            out[-start:] = self.data[:self.index]
+        return out
+
+
+class SpectrumAnalyzer:
+    """Log-spaced band levels from a Hann-windowed real FFT
+
+    The window, the FFT bin of every band edge and the level scaling are
+    computed once; each call is one rfft plus one reduceat over the power
+    spectrum.
+    """
+    def __init__(self, sample_rate=SAMPLE_RATE, fft_size=1024, bands=12,
+                 min_freq=80.0, max_freq=7600.0, floor_db=-70.0, range_db=60.0):
+        self.fft_size = fft_size
+        self.bands = bands
+        self.window = np.hanning(fft_size).astype(np.float32)
+        # Power of a full-scale sine comes out at 0 dB
+        self.scale = 4.0 / np.sum(self.window) ** 2
+        max_freq = min(max_freq, sample_rate / 2)
+        edges = np.geomspace(min_freq, max_freq, bands + 1)
+        bins = np.round(edges * fft_size / sample_rate).astype(int)
+        # Every band gets at least one bin, even the narrow low ones
+        bins = np.maximum(bins, np.arange(bins[0], bins[0] + bands + 1))
+        self.edges = bins
+        self.widths = np.diff(bins).astype(np.float32)
+        self.floor_db = floor_db
+        self.range_db = range_db
+        self.frame = np.zeros(fft_size, np.float32)
+
+    def band_power(self, samples):
+        """Mean power in each band for fft_size samples"""
+        np.multiply(samples, self.window, out=self.frame)
+        spectrum = np.fft.rfft(self.frame)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2) * self.scale
+        return np.add.reduceat(power, self.edges)[:self.bands] / self.widths
+
+    def levels(self, samples):
+        """Band levels on the visualizer's 0-100 scale"""
+        db = 10 * np.log10(self.band_power(samples) + 1e-12)
+        return np.clip((db - self.floor_db) * (100.0 / self.range_db), 5, 100)
+
+
+class AudioEngine(QThread):
+    """Background thread that streams an audio source into a ring buffer
+
+    Fixed-size chunks are read into one preallocated buffer and appended to
+    the ring; after each chunk the band levels of the newest FFT window are
+    recomputed, so the GUI only has to pick them up. Every chunk also goes
+    through a voice activity detector, and only complete speech segments
+    are handed on, together with their MFCCs, which are computed
+    incrementally while the speech is still arriving.
+    """
+
+    # Emitted once the source has been opened (True) or failed to open (False)
+    opened = pyqtSignal(bool)
+    # Emitted when the detector hears speech begin
+    speech_started = pyqtSignal()
+    # Emitted with each finished speech segment (float32 samples, raw MFCC matrix)
+    speech_segment = pyqtSignal(object, object)
+
+    def __init__(self, device=None, bands=12, ring_seconds=2.0, sensitivity=75, parent=None):
+        super().__init__(parent)
+        # A WAV file path, an input device or any AudioSource
+        self.source = make_audio_source(device)
+        self.bands = bands
+        self.ring_seconds = ring_seconds
+        self.ring = None
+        self.analyzer = None
+        self.chunk = np.zeros(CHUNK_SIZE, np.float32)
+        self.window = None
+        self.current_levels = np.full(bands, 5.0)
+        self.sensitivity = sensitivity
+        self.vad = None
+        self.lock = threading.Lock()
+        self.running = False
+
+    def run(self):
+        """Open the source and keep reading chunks until stopped or the input ends"""
+        # Set before opening, so a stop() during a slow open is not overwritten
+        self.running = True
+        if not self.source.open():
+            self.running = False
+            self.opened.emit(False)
+            return
+        if not self.running or self.isInterruptionRequested():
+            # Stopped while the input was opening: give it straight back
+            self.running = False
+            self.source.close()
+            return
+
+        rate = self.source.sample_rate
+        self.ring = AudioRing(int(rate * self.ring_seconds))
+        self.analyzer = SpectrumAnalyzer(rate, bands=self.bands)
+        self.window = np.zeros(self.analyzer.fft_size, np.float32)
+        self.vad = VoiceActivityDetector(rate, sensitivity=self.sensitivity,
+                                         features=StreamingMfcc(rate))
+        self.opened.emit(True)
+
+        while self.running and not self.isInterruptionRequested():
+            count = self.source.read(self.chunk)
+            if not count:
+                break
+            self.process_chunk(self.chunk[:count])
+
+        self.running = False
+        self.source.close()
+
+    def process_chunk(self, samples):
+        """Store a chunk and refresh the band levels"""
+        self.ring.write(samples)
+        levels = self.analyzer.levels(self.ring.latest(self.window))
+        with self.lock:
+            self.current_levels = levels
+
+        was_speaking = self.vad.in_speech
+        for segment, features in self.vad.process(samples):
+            self.speech_segment.emit(segment, features)
+        if self.vad.in_speech and not was_speaking:
+            self.speech_started.emit()
+
+    def set_sensitivity(self, sensitivity):
+        """Apply the Microphone Sensitivity setting to the speech detector"""
+        self.sensitivity = sensitivity
+        if self.vad is not None:
+            self.vad.set_sensitivity(sensitivity)
+
+    def silence_ratio(self):
+        """Fraction of the input so far that was not passed on as speech"""
+        return self.vad.silence_ratio() if self.vad is not None else 0.0
+
+    def levels(self):
+        """Most recent band levels (0-100)"""
+        with self.lock:
+            return self.current_levels
+
+    def stop(self, timeout=1000):
+        """Ask the reading loop to finish and wait for it to release the input"""
+        self.requestInterruption()
+        self.running = False
+        self.wait(timeout)
@@ -0,0 +1,133 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+def hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + np.asarray(hz) / 700.0)
+
+
+def mel_to_hz(mel):
+    return 700.0 * (10.0 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def mel_filterbank(sample_rate, fft_size, n_mels, min_freq=20.0, max_freq=None):
+    """Return an (n_fft_bins, n_mels) matrix of triangular mel filters"""
+    max_freq = max_freq or sample_rate / 2
+    bins = np.fft.rfftfreq(fft_size, 1.0 / sample_rate)
+    points = mel_to_hz(np.linspace(hz_to_mel(min_freq), hz_to_mel(max_freq), n_mels + 2))
+    lower, centre, upper = points[:-2, None], points[1:-1, None], points[2:, None]
+    rising = (bins[None, :] - lower) / (centre - lower)
+    falling = (upper - bins[None, :]) / (upper - centre)
+    return np.maximum(0.0, np.minimum(rising, falling)).T.astype(np.float32)
+
+
+def dct_matrix(n_mels, n_mfcc):
+    """Return an (n_mels, n_mfcc) orthonormal DCT-II matrix"""
+    n = np.arange(n_mels)
+    k = np.arange(n_mfcc)
+    matrix = np.cos(np.pi / n_mels * (n[:, None] + 0.5) * k[None, :]) * np.sqrt(2.0 / n_mels)
+    matrix[:, 0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+@lru_cache(maxsize=8)
+def analysis_matrices(sample_rate, frame_size, fft_size, n_mels, n_mfcc):
+    """Window, mel filterbank and DCT matrix, built once per configuration"""
+    window = np.hamming(frame_size).astype(np.float32)
+    filterbank = mel_filterbank(sample_rate, fft_size, n_mels)
+    dct = dct_matrix(n_mels, n_mfcc)
+    for matrix in (window, filterbank, dct):
+        # Shared between extractors, so nobody may modify them
+        matrix.flags.writeable = False
+    return window, filterbank, dct
+
+
+class MfccExtractor:
+    """MFCC features for a whole utterance, computed in one pass
+
+    The window, mel filterbank and DCT matrix are built once. Frames are a
+    strided view of the samples, so the FFT, filterbank and DCT each run as
+    a single matrix operation over all frames. Cepstral mean normalization
+    removes the microphone's fixed colouring.
+    """
+    def __init__(self, sample_rate=16000, frame_ms=25, hop_ms=10, fft_size=512,
+                 n_mels=40, n_mfcc=13):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.fft_size = fft_size
+        self.n_mfcc = n_mfcc
+        self.window, self.filterbank, self.dct = analysis_matrices(
+            sample_rate, self.frame_size, fft_size, n_mels, n_mfcc)
+
+    def frames(self, samples):
+        """Strided (n, frame_size) view of the samples' analysis frames"""
+        samples = np.ascontiguousarray(samples, np.float32)
+        if len(samples) < self.frame_size:
+            samples = np.pad(samples, (0, self.frame_size - len(samples)))
+        count = 1 + (len(samples) - self.frame_size) // self.hop
+        return np.lib.stride_tricks.as_strided(
+            samples, (count, self.frame_size), (samples.strides[0] * self.hop, samples.strides[0]),
+            writeable=False)
+
+    def features(self, frames):
+        """Raw MFCCs for (n, frame_size) frames"""
+        spectrum = np.fft.rfft(frames * self.window, self.fft_size, axis=1)
+        power = (spectrum.real ** 2 + spectrum.imag ** 2).astype(np.float32)
+        return np.log(power @ self.filterbank + 1e-6) @ self.dct
+
+    def compute(self, samples):
+        """Return the (n_frames, n_mfcc) normalized MFCC matrix of an utterance"""
+        mfcc = self.features(self.frames(samples))
+        return mfcc - mfcc.mean(axis=0)
+
+
+class StreamingMfcc(MfccExtractor):
+    """MFCC features computed incrementally as audio arrives
+
+    Each push only analyses the frames completed by the new samples. The
+    overlap with the previous frame is carried over instead of being
+    analysed again, so an utterance costs the same however it is chunked.
+    Rows go into a preallocated feature matrix that doubles when full. The
+    frames match those of MfccExtractor over the same samples.
+    """
+    def __init__(self, sample_rate=16000, capacity=256, **kwargs):
+        super().__init__(sample_rate, **kwargs)
+        self.matrix = np.zeros((capacity, self.n_mfcc), np.float32)
+        self.count = 0
+        self.tail = np.zeros(0, np.float32)
+
+    def reset(self):
+        """Start a new utterance, keeping the allocated matrix"""
+        self.count = 0
+        self.tail = np.zeros(0, np.float32)
+
+    def push(self, samples):
+        """Analyse the frames completed by samples; return how many rows were added"""
+        data = np.concatenate([self.tail, np.asarray(samples, np.float32)])
+        if len(data) < self.frame_size:
+            self.tail = data
+            return 0
+        count = 1 + (len(data) - self.frame_size) // self.hop
+        frames = np.lib.stride_tricks.as_strided(
+            data, (count, self.frame_size), (data.strides[0] * self.hop, data.strides[0]),
+            writeable=False)
+        self.reserve(self.count + count)
+        self.matrix[self.count:self.count + count] = self.features(frames)
+        self.count += count
+        # Keep the samples the next frame shares with this one
+        self.tail = data[count * self.hop:].copy()
+        return count
+
+    def reserve(self, rows):
+        """Grow the feature matrix so it holds at least rows rows"""
+        if rows <= len(self.matrix):
+            return
+        grown = np.zeros((max(rows, 2 * len(self.matrix)), self.n_mfcc), np.float32)
+        grown[:self.count] = self.matrix[:self.count]
+        self.matrix = grown
+
+    def result(self):
+        """Raw MFCCs of the utterance so far (a view; copy it to keep it past reset)"""
+        return self.matrix[:self.count]
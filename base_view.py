@@ -11,6 +11,8 @@ class BaseView(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
+        # False while the view is not the current page or the window is minimized
+        self.view_active = True
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
         self.setup_ui()
@@ -65,3 +67,7 @@ class BaseView(QWidget):
         
         # Add navigation bar to the bottom of the layout
         # This will be added at the end of each view's setup
+        
+    def set_view_active(self, active):
+        """Called when the view becomes visible on screen (True) or hidden (False)"""
+        self.view_active = active
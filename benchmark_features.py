@@ -0,0 +1,112 @@
+"""Standalone MFCC feature extraction benchmark
+
+Streams audio from a WAV file or a synthetic signal through the
+incremental MFCC extractor in fixed-size chunks, the way the audio engine
+delivers them, and reports throughput and per-chunk latency against the
+chunk's duration. With --compare, the same audio is also analysed by
+recomputing the whole buffered utterance after every chunk.
+
+    python benchmark_features.py --seconds 30
+    python benchmark_features.py --path speech.wav --chunk 160
+    python benchmark_features.py --seconds 6 --compare
+"""
+import argparse
+import time
+import wave
+
+import numpy as np
+
+from audio_features import MfccExtractor, StreamingMfcc
+
+
+def load_audio(args):
+    """Return (samples, sample rate) for the input selected on the command line"""
+    if args.path:
+        with wave.open(args.path, "rb") as reader:
+            if reader.getsampwidth() != 2:
+                raise SystemExit("Only 16-bit PCM WAV files are supported")
+            rate = reader.getframerate()
+            channels = reader.getnchannels()
+            samples = np.frombuffer(reader.readframes(reader.getnframes()), np.int16)
+        if channels > 1:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        return (samples * (1.0 / 32768)).astype(np.float32), rate
+
+    # Gliding harmonics with a little noise, roughly speech-like in spectrum
+    rate = args.rate
+    t = np.arange(int(args.seconds * rate)) / rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / rate
+    audio = sum(np.sin(k * phase) / k for k in range(1, 8)) * 0.2
+    audio += np.random.default_rng(0).normal(scale=0.01, size=len(t))
+    return audio.astype(np.float32), rate
+
+
+def run_streaming(samples, rate, chunk):
+    """Push samples chunk by chunk; return (elapsed seconds, per-chunk seconds, extractor)"""
+    extractor = StreamingMfcc(rate)
+    # Warm up FFT plans and the allocator outside the measurement
+    extractor.push(samples[:chunk * 4])
+    extractor.reset()
+
+    costs = np.zeros(len(samples) // chunk)
+    started = time.perf_counter()
+    for index in range(len(costs)):
+        start = time.perf_counter()
+        extractor.push(samples[index * chunk:(index + 1) * chunk])
+        costs[index] = time.perf_counter() - start
+    return time.perf_counter() - started, costs, extractor
+
+
+def run_recompute(samples, rate, chunk):
+    """Recompute features over the whole buffer after each chunk; return (elapsed, per-chunk)"""
+    extractor = MfccExtractor(rate)
+    costs = np.zeros(len(samples) // chunk)
+    started = time.perf_counter()
+    for index in range(len(costs)):
+        start = time.perf_counter()
+        extractor.features(extractor.frames(samples[:(index + 1) * chunk]))
+        costs[index] = time.perf_counter() - start
+    return time.perf_counter() - started, costs
+
+
+def report(name, elapsed, costs, audio_seconds, chunk_seconds):
+    ms = costs * 1000
+    print(f"{name:<12}{audio_seconds / elapsed:>10.0f}x{ms.mean():>10.3f}{np.percentile(ms, 50):>10.3f}"
+          f"{np.percentile(ms, 99):>10.3f}{np.percentile(costs, 99) / chunk_seconds * 100:>9.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MFCC extraction without a GUI")
+    parser.add_argument("--path", help="16-bit PCM WAV file (default: synthetic audio)")
+    parser.add_argument("--seconds", type=float, default=20.0, help="length of the synthetic audio")
+    parser.add_argument("--rate", type=int, default=16000, help="sample rate of the synthetic audio")
+    parser.add_argument("--chunk", type=int, default=512, help="samples delivered per push")
+    parser.add_argument("--compare", action="store_true",
+                        help="also time recomputing the whole buffer after every chunk")
+    args = parser.parse_args(argv)
+
+    samples, rate = load_audio(args)
+    if len(samples) < args.chunk * 4:
+        raise SystemExit("Not enough audio for the chosen chunk size")
+    audio_seconds = len(samples) / rate
+    chunk_seconds = args.chunk / rate
+
+    elapsed, costs, extractor = run_streaming(samples, rate, args.chunk)
+    reference = MfccExtractor(rate)
+    expected = reference.features(reference.frames(samples[:len(costs) * args.chunk]))
+    error = np.abs(extractor.result() - expected).max()
+
+    print(f"Audio:       {audio_seconds:.1f} s at {rate} Hz, {args.chunk}-sample chunks "
+          f"({chunk_seconds * 1000:.1f} ms)")
+    print(f"Frames:      {extractor.count} (max difference from one-pass extraction {error:.2e})")
+    print()
+    print(f"{'method':<12}{'realtime':>11}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'p99/chunk':>10}")
+    report("streaming", elapsed, costs, audio_seconds, chunk_seconds)
+    if args.compare:
+        elapsed, costs = run_recompute(samples, rate, args.chunk)
+        report("recompute", elapsed, costs, audio_seconds, chunk_seconds)
+
+
+if __name__ == "__main__":
+    main()
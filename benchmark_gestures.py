@@ -0,0 +1,122 @@
+"""Headless gesture pipeline benchmark
+
+Pushes frames from a camera, a video file or the synthetic generator through
+the full gesture pipeline without a GUI and reports throughput, per-stage
+latency percentiles and peak memory.
+
+    python benchmark_gestures.py --source synthetic --frames 1000 --width 1280 --height 720
+    python benchmark_gestures.py --source file --path clip.mp4
+    python benchmark_gestures.py --source camera --device 0 --frames 300
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from frame_sources import CameraSource, SyntheticSource, VideoFileSource
+from gesture_pipeline import GesturePipeline
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def build_source(args):
+    """Create the frame source selected on the command line"""
+    if args.source == "camera":
+        return CameraSource(args.device)
+    if args.source == "file":
+        if not args.path:
+            raise SystemExit("--path is required with --source file")
+        return VideoFileSource(args.path, loop=True)
+    return SyntheticSource(args.width, args.height, hands=args.hands)
+
+
+def run(source, pipeline, frames, warmup=10):
+    """Run frames through the pipeline; return (elapsed seconds, stage timings, gestures)"""
+    stages = ["capture"] + list(pipeline.timings) + ["total"]
+    timings = {stage: np.zeros(frames) for stage in stages}
+    gestures = 0
+    frame = None
+
+    for _ in range(warmup):
+        ok, frame = source.read(frame)
+        if ok:
+            pipeline.process(frame)
+    pipeline.reset()
+
+    processed = 0
+    started = time.perf_counter()
+    while processed < frames:
+        start = time.perf_counter()
+        ok, frame = source.read(frame)
+        if not ok:
+            break
+        captured = time.perf_counter()
+        result = pipeline.process(frame)
+        done = time.perf_counter()
+
+        timings["capture"][processed] = captured - start
+        for stage, seconds in pipeline.timings.items():
+            timings[stage][processed] = seconds
+        timings["total"][processed] = done - start
+        if result.gesture is not None:
+            gestures += 1
+        processed += 1
+
+    elapsed = time.perf_counter() - started
+    return elapsed, {stage: values[:processed] for stage, values in timings.items()}, gestures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the gesture pipeline without a GUI")
+    parser.add_argument("--source", choices=["synthetic", "file", "camera"], default="synthetic")
+    parser.add_argument("--path", help="video file for --source file")
+    parser.add_argument("--device", type=int, default=0, help="camera index for --source camera")
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--hands", type=int, default=1)
+    parser.add_argument("--level", type=int, default=1, help="analysis pyramid level")
+    args = parser.parse_args(argv)
+
+    source = build_source(args)
+    if not source.open():
+        raise SystemExit(f"Could not open {source.describe()}")
+    pipeline = GesturePipeline(args.level)
+    try:
+        elapsed, timings, gestures = run(source, pipeline, args.frames)
+    finally:
+        source.release()
+
+    processed = len(timings["total"])
+    if not processed:
+        raise SystemExit("No frames were processed")
+
+    print(f"Source:      {source.describe()}")
+    print(f"Frames:      {processed} in {elapsed:.2f} s ({processed / elapsed:.1f} fps)")
+    print(f"Gestures:    {gestures}")
+    print(f"Motion skip: {pipeline.skip_ratio() * 100:.1f}%")
+    print(f"Tracked:     {pipeline.track_ratio() * 100:.1f}%")
+    print()
+    print(f"{'stage':<12}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for stage, values in timings.items():
+        ms = values * 1000
+        print(f"{stage:<12}{ms.mean():>10.3f}{np.percentile(ms, 50):>10.3f}{np.percentile(ms, 99):>10.3f}")
+    print()
+    rss = peak_rss_mb()
+    print(f"Peak RSS:    {rss:.1f} MB" if rss is not None else "Peak RSS:    n/a")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from frame_sources import make_source
+
+
+class FrameRing:
+    """Triple-buffered frame ring that only ever hands out the newest frame
+
+    The capture thread owns the back slot and reads straight into it, the GUI
+    owns the front slot while it processes a frame, and the middle slot holds
+    the newest published frame. Publishing over an unread frame drops it, so
+    a slow consumer never sees stale frames and nothing is allocated per frame.
+    """
+    def __init__(self):
+        self.slots = [None, None, None]
+        self.timestamps = [0.0, 0.0, 0.0]
+        self.back = 0
+        self.ready = 1
+        self.front = 2
+        self.has_unread = False
+        self.published = 0
+        self.dropped = 0
+        self.lock = threading.Lock()
+
+    def write_slot(self):
+        """Return the buffer the capture thread should read the next frame into"""
+        return self.slots[self.back]
+
+    def publish(self, frame, timestamp):
+        """Publish a captured frame; return True if the consumer needs a wake-up"""
+        with self.lock:
+            self.slots[self.back] = frame
+            self.timestamps[self.back] = timestamp
+            self.back, self.ready = self.ready, self.back
+            self.published += 1
+            if self.has_unread:
+                self.dropped += 1
+                return False
+            self.has_unread = True
+            return True
+
+    def latest(self):
+        """Return (frame, timestamp) for the newest unread frame, or None"""
+        with self.lock:
+            if not self.has_unread:
+                return None
+            self.front, self.ready = self.ready, self.front
+            self.has_unread = False
+            return self.slots[self.front], self.timestamps[self.front]
+
+    def reset(self):
+        """Forget all buffered frames and counters"""
+        with self.lock:
+            self.slots = [None, None, None]
+            self.has_unread = False
+            self.published = 0
+            self.dropped = 0
+
+
+class CaptureWorker(QThread):
+    """Background thread that owns a frame source and publishes its frames"""
+
+    # Emitted once the device has been opened (True) or failed to open (False)
+    opened = pyqtSignal(bool)
+    # Emitted when a new frame is waiting in the ring; never queued twice
+    frame_ready = pyqtSignal()
+
+    # Consecutive failed reads before the camera is considered lost
+    MAX_READ_FAILURES = 50
+
+    def __init__(self, device=0, parent=None):
+        super().__init__(parent)
+        # A camera index, a video file path or any FrameSource
+        self.source = make_source(device)
+        self.ring = FrameRing()
+        self.running = False
+        # Optional ClipRecorder fed with every captured frame
+        self.recorder = None
+
+    def run(self):
+        """Open the source and keep reading frames until stopped"""
+        # Set before opening, so a stop() during a slow open is not overwritten
+        self.running = True
+        if not self.source.open():
+            self.running = False
+            self.opened.emit(False)
+            return
+        if not self.running or self.isInterruptionRequested():
+            # Stopped while the device was opening: give it straight back
+            self.running = False
+            self.source.release()
+            return
+
+        self.opened.emit(True)
+
+        failures = 0
+        while self.running and not self.isInterruptionRequested():
+            ret, frame = self.source.read(self.ring.write_slot())
+            if not ret:
+                failures += 1
+                if failures >= self.MAX_READ_FAILURES:
+                    break
+                self.msleep(10)
+                continue
+            failures = 0
+
+            timestamp = time.monotonic()
+            if self.ring.publish(frame, timestamp):
+                self.frame_ready.emit()
+            # The published frame is only read from here on, never overwritten
+            if self.recorder is not None:
+                self.recorder.write(frame, timestamp)
+
+        self.running = False
+        self.source.release()
+
+    def take_frame(self):
+        """Return (frame, timestamp) for the newest frame, or None if nothing new"""
+        return self.ring.latest()
+
+    def stop(self, timeout=1000):
+        """Ask the capture loop to finish and wait for it to release the device"""
+        self.requestInterruption()
+        self.running = False
+        self.wait(timeout)
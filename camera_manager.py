@@ -0,0 +1,195 @@
+import threading
+
+from frame_sources import CameraSource, FrameSource
+
+# Seconds an unused camera stays open so a restart does not reopen the device
+GRACE_PERIOD = 20.0
+
+
+class CameraHandle:
+    """An open camera shared through the manager, with its user count"""
+    def __init__(self, device):
+        self.source = CameraSource(device)
+        self.users = 0
+        self.ok = False
+        # Set once the open attempt has finished, successfully or not
+        self.ready = threading.Event()
+        # Set once the device has been released
+        self.closed = threading.Event()
+        self.close_timer = None
+        # Close as soon as the last user is done instead of staying warm
+        self.discard = False
+
+
+class CameraManager:
+    """Keeps cameras open and warm between uses
+
+    Opening a V4L2 device can take close to a second, so a camera is not
+    closed when its last user releases it. It stays open for a grace period
+    and a restart within that period gets the already-open handle back.
+    Cameras can also be opened ahead of time on a background thread.
+    """
+    def __init__(self, grace_period=GRACE_PERIOD):
+        self.grace_period = grace_period
+        self.handles = {}
+        self.lock = threading.Lock()
+
+    def set_grace_period(self, seconds):
+        """Change how long unused cameras are kept open"""
+        self.grace_period = max(0.0, seconds)
+
+    def acquire(self, device):
+        """Return an open CameraSource for device, or None if it cannot be opened
+
+        Blocks while the device is being opened, so call it off the GUI thread.
+        """
+        with self.lock:
+            handle = self.handles.get(device)
+            opener = handle is None
+            if opener:
+                handle = self.handles[device] = CameraHandle(device)
+            if handle.close_timer is not None:
+                handle.close_timer.cancel()
+                handle.close_timer = None
+            handle.users += 1
+
+        if opener:
+            handle.ok = handle.source.open()
+            handle.ready.set()
+        else:
+            handle.ready.wait()
+            cap = handle.source.cap
+            if handle.ok and cap is not None:
+                # Drop the frame that went stale in the driver while idle
+                cap.grab()
+
+        if not handle.ok:
+            with self.lock:
+                handle.users -= 1
+                if self.handles.get(device) is handle:
+                    del self.handles[device]
+            return None
+        return handle.source
+
+    def release(self, device):
+        """Give a camera back; it is closed once unused for the grace period"""
+        with self.lock:
+            handle = self.handles.get(device)
+            if handle is None or handle.users == 0:
+                return
+            handle.users -= 1
+            if handle.users > 0:
+                return
+            if self.grace_period <= 0 or handle.discard:
+                del self.handles[device]
+            else:
+                handle.close_timer = threading.Timer(self.grace_period, self.close_idle,
+                                                     (device, handle))
+                handle.close_timer.daemon = True
+                handle.close_timer.start()
+                return
+        handle.source.release()
+        handle.closed.set()
+
+    def close_idle(self, device, handle):
+        """Close a camera whose grace period ran out, unless it was reused"""
+        with self.lock:
+            if self.handles.get(device) is not handle or handle.users > 0:
+                return
+            del self.handles[device]
+        handle.source.release()
+        handle.closed.set()
+
+    def close_devices(self, devices, timeout=2.0):
+        """Close the warm handles of devices now, e.g. before another process opens them
+
+        A camera that is still being warmed up is closed as soon as its open
+        finishes; this waits up to timeout for that, and not at all with a
+        timeout of 0. Cameras in use are closed when their last user releases
+        them, without waiting here.
+        """
+        closing = []
+        waiting = []
+        with self.lock:
+            for device in devices:
+                handle = self.handles.get(device)
+                if handle is None:
+                    continue
+                handle.discard = True
+                if handle.close_timer is not None:
+                    handle.close_timer.cancel()
+                    handle.close_timer = None
+                if handle.users == 0:
+                    del self.handles[device]
+                    closing.append(handle)
+                elif not handle.ready.is_set():
+                    waiting.append(handle)
+        for handle in closing:
+            handle.source.release()
+            handle.closed.set()
+        if timeout > 0:
+            for handle in waiting:
+                handle.closed.wait(timeout)
+
+    def preopen(self, device):
+        """Open a camera on a background thread so the next start is instant"""
+        def warm_up():
+            if self.acquire(device) is not None:
+                self.release(device)
+
+        with self.lock:
+            if device in self.handles:
+                return
+        threading.Thread(target=warm_up, daemon=True).start()
+
+    def is_open(self, device):
+        """Whether the camera is open (in use or warm)"""
+        with self.lock:
+            handle = self.handles.get(device)
+            return handle is not None and handle.ok
+
+    def shutdown(self):
+        """Close every camera now, e.g. when the application exits"""
+        with self.lock:
+            handles = list(self.handles.values())
+            self.handles.clear()
+        for handle in handles:
+            if handle.close_timer is not None:
+                handle.close_timer.cancel()
+            handle.ready.wait(2.0)
+            handle.source.release()
+            handle.closed.set()
+
+
+# Shared by every view in the application
+camera_manager = CameraManager()
+
+
+class SharedCameraSource(FrameSource):
+    """Camera source that borrows its device from a CameraManager"""
+
+    live = True
+
+    def __init__(self, device=0, manager=None):
+        self.device = device
+        self.manager = manager or camera_manager
+        self.camera = None
+
+    def open(self):
+        self.camera = self.manager.acquire(self.device)
+        return self.camera is not None
+
+    def read(self, frame=None):
+        if self.camera is None:
+            return False, frame
+        return self.camera.read(frame)
+
+    def release(self):
+        if self.camera is not None:
+            self.camera = None
+            self.manager.release(self.device)
+
+    def describe(self):
+        if self.camera is not None:
+            return self.camera.describe()
+        return f"camera {self.device}"
@@ -0,0 +1,186 @@
+import json
+import os
+import sys
+import time
+
+import cv2
+
+# Where the best capture mode found for each camera is remembered
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".gaminator", "camera_profiles.json")
+
+# Capture modes tried on first use, roughly from most to least desirable
+CANDIDATE_RESOLUTIONS = [(1280, 720), (640, 480)]
+CANDIDATE_FOURCCS = ["MJPG", "YUYV"]
+CANDIDATE_FPS = [60, 30]
+# Driver buffer sizes, smallest (lowest latency) first
+CANDIDATE_BUFFERSIZES = [1, 2, 4]
+
+# Properties a probe changes, restored when no candidate mode works
+PROBED_PROPERTIES = [cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT,
+                     cv2.CAP_PROP_FPS, cv2.CAP_PROP_BUFFERSIZE]
+
+
+def fourcc_code(name):
+    """Return OpenCV's integer code for a four-character codec name"""
+    return cv2.VideoWriter_fourcc(*name)
+
+
+def device_key(device, cap):
+    """Return a cache key that identifies a camera across restarts"""
+    backend = cap.getBackendName() if hasattr(cap, "getBackendName") else "default"
+    name = ""
+    if sys.platform.startswith("linux") and isinstance(device, int):
+        # V4L2 exposes a stable product name for each /dev/videoN node
+        try:
+            with open(f"/sys/class/video4linux/video{device}/name") as f:
+                name = f.read().strip()
+        except OSError:
+            pass
+    return f"{backend}:{device}:{name}"
+
+
+def apply_profile(cap, profile):
+    """Apply a capture profile to an open VideoCapture"""
+    # The codec has to be set before the resolution for most V4L2 drivers
+    cap.set(cv2.CAP_PROP_FOURCC, fourcc_code(profile["fourcc"]))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile["width"])
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile["height"])
+    cap.set(cv2.CAP_PROP_FPS, profile["fps"])
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, profile["buffersize"])
+
+
+def read_properties(cap):
+    """Return the current values of the properties a probe changes"""
+    return [cap.get(prop) for prop in PROBED_PROPERTIES]
+
+
+def restore_properties(cap, values):
+    """Put back properties saved with read_properties"""
+    for prop, value in zip(PROBED_PROPERTIES, values):
+        cap.set(prop, value)
+
+
+def measure(cap, frames=12, idle=0.2):
+    """Return (frames per second, estimated latency in ms) for the current mode
+
+    Throughput is timed over consecutive reads. Latency is estimated by
+    idling and then counting how many reads return instantly: those frames
+    were already sitting in the driver's buffer and are that many intervals
+    old by the time the application sees them.
+    """
+    for _ in range(3):
+        if not cap.read()[0]:
+            return 0.0, float("inf")
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        if not cap.read()[0]:
+            return 0.0, float("inf")
+    interval = (time.perf_counter() - start) / frames
+
+    time.sleep(idle)
+    buffered = 0
+    for _ in range(4):
+        read_start = time.perf_counter()
+        if not cap.read()[0]:
+            break
+        if time.perf_counter() - read_start < interval / 4:
+            buffered += 1
+        else:
+            break
+
+    return 1.0 / interval, (buffered + 1) * interval * 1000
+
+
+class CameraProfileCache:
+    """Probes capture modes once per camera and remembers the best one
+
+    The first time a camera is opened every candidate resolution, codec,
+    frame rate and driver buffer size is applied and measured. The winner is
+    saved to a JSON file keyed by device, so later opens apply it straight
+    away without probing. A camera where no candidate works is remembered
+    as using its driver defaults, so it is not probed on every open either.
+    """
+    def __init__(self, path=CACHE_PATH, target_fps=30):
+        self.path = path
+        self.target_fps = target_fps
+        self.profiles = None
+
+    def load(self):
+        """Read the cache file once; a missing or corrupt file means an empty cache"""
+        if self.profiles is None:
+            try:
+                with open(self.path) as f:
+                    self.profiles = json.load(f)
+            except (OSError, ValueError):
+                self.profiles = {}
+        return self.profiles
+
+    def save(self):
+        """Write the cache file, keeping entries other processes added meanwhile"""
+        try:
+            with open(self.path) as f:
+                profiles = json.load(f)
+        except (OSError, ValueError):
+            profiles = {}
+        profiles.update(self.profiles)
+        self.profiles = profiles
+        # Capture processes probe their cameras at the same time, so write
+        # to a private file and swap it in whole
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(temp_path, "w") as f:
+                json.dump(profiles, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    def configure(self, device, cap):
+        """Apply the cached profile for this camera, probing it first if unknown"""
+        key = device_key(device, cap)
+        profile = self.load().get(key)
+        if profile is None:
+            original = read_properties(cap)
+            profile = self.probe(cap)
+            if profile is None:
+                # Leave the camera as the driver set it up, not in the last mode tried
+                restore_properties(cap, original)
+                profile = {"defaults": True}
+            self.profiles[key] = profile
+            self.save()
+        if profile.get("defaults"):
+            return None
+        apply_profile(cap, profile)
+        return profile
+
+    def probe(self, cap):
+        """Try every candidate mode and return the best one, or None"""
+        best = None
+        best_score = None
+        for width, height in CANDIDATE_RESOLUTIONS:
+            for fourcc in CANDIDATE_FOURCCS:
+                for fps in CANDIDATE_FPS:
+                    for buffersize in CANDIDATE_BUFFERSIZES:
+                        profile = {"width": width, "height": height, "fourcc": fourcc,
+                                   "fps": fps, "buffersize": buffersize}
+                        apply_profile(cap, profile)
+                        # Skip modes the driver silently replaced with something else
+                        if (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) != width or
+                                int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) != height):
+                            break
+                        measured_fps, latency = measure(cap)
+                        if measured_fps <= 0:
+                            continue
+                        profile["measured_fps"] = round(measured_fps, 1)
+                        profile["latency_ms"] = round(latency, 1)
+
+                        # Reach the target rate first, then lowest latency, then most pixels
+                        score = (min(round(measured_fps), self.target_fps), -latency,
+                                 width * height)
+                        if best_score is None or score > best_score:
+                            best, best_score = profile, score
+                        # A deeper buffer only adds latency once the rate is reached
+                        if measured_fps >= 0.9 * min(fps, self.target_fps):
+                            break
+        return best
@@ -0,0 +1,210 @@
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Directory for the ring file and the saved clips
+CLIPS_DIR = os.path.join(os.path.expanduser("~"), ".gaminator", "clips")
+
+
+def remove_ring(frames):
+    """Delete a ring file; an open mapping stays usable where the OS allows it"""
+    try:
+        os.remove(frames.filename)
+    except OSError:
+        pass
+
+
+class ClipRecorder:
+    """Keeps the last seconds of capture in a memory-mapped ring and saves clips
+
+    The capture thread downscales every frame it is given (up to the
+    recorder's frame rate) straight into the next slot of a fixed-size
+    memory-mapped ring file. That is a plain memory write: the OS writes the
+    pages back on its own, so capture never waits for the disk. The ring
+    file itself is created and pre-faulted on the background thread: frames
+    that arrive before it is ready, or at a new resolution, are skipped
+    until it is. Triggering the recorder queues a request; the background
+    thread waits until the window after the trigger has been captured,
+    copies the window out of the ring, encodes it to a clip file and
+    deletes the oldest clips beyond max_clips or max_bytes.
+    """
+    def __init__(self, directory=CLIPS_DIR, width=320, fps=15, ring_seconds=8.0,
+                 before=3.0, after=1.0, max_clips=50, max_bytes=500 * 1024 * 1024):
+        self.directory = directory
+        self.width = width
+        self.fps = fps
+        self.slots = int(ring_seconds * fps)
+        self.before = before
+        self.after = after
+        self.max_clips = max_clips
+        self.max_bytes = max_bytes
+        # Called with the clip path from the dump thread once a clip is saved
+        self.on_saved = None
+
+        self.frames = None
+        self.timestamps = np.zeros(self.slots, np.float64)
+        self.index = 0
+        self.last_write = 0.0
+        # Ring size (width, height) requested from the background thread
+        self.pending_size = None
+        self.rings_created = 0
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.thread = None
+        self.clips_saved = 0
+
+    def start(self):
+        """Start the background thread, e.g. when capture starts"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.dump_loop, daemon=True)
+            self.thread.start()
+
+    def allocate(self, size):
+        """Create and pre-fault the ring file for frames of size (background thread)"""
+        width, height = size
+        os.makedirs(self.directory, exist_ok=True)
+        self.rings_created += 1
+        # A new file each time: the capture thread may still be writing to the old one
+        path = os.path.join(self.directory, f"ring-{os.getpid()}-{self.rings_created}.dat")
+        frames = np.memmap(path, np.uint8, "w+", shape=(self.slots, height, width, 3))
+        # Touch every page now so the capture thread never takes a page fault on disk
+        frames[:] = 0
+        with self.lock:
+            old = self.frames
+            self.timestamps[:] = 0.0
+            self.index = 0
+            self.frames = frames
+        if old is not None:
+            remove_ring(old)
+
+    def write(self, frame, timestamp):
+        """Add a captured frame to the ring (called on the capture thread)"""
+        if timestamp - self.last_write < 1.0 / self.fps:
+            return
+        self.last_write = timestamp
+
+        height, width = frame.shape[:2]
+        size = (self.width, max(1, height * self.width // width))
+        with self.lock:
+            frames = self.frames
+            slot = self.index
+        if frames is None or frames.shape[2:0:-1] != size:
+            # The background thread sets the ring up; skip frames until then
+            if self.pending_size != size:
+                self.pending_size = size
+                self.start()
+                self.requests.put(("allocate", size))
+            return
+
+        cv2.resize(frame, size, dst=frames[slot], interpolation=cv2.INTER_AREA)
+        with self.lock:
+            if self.frames is frames:
+                self.timestamps[slot] = timestamp
+                self.index = (slot + 1) % self.slots
+
+    def trigger(self, label, timestamp=None):
+        """Save the window around timestamp (default now) to a clip file"""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        self.start()
+        self.requests.put(("clip", label, timestamp))
+
+    def remove_stale_rings(self):
+        """Delete ring files left behind by earlier runs that did not close cleanly"""
+        own = f"ring-{os.getpid()}-"
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            if (entry.name.startswith("ring-") and entry.name.endswith(".dat") and
+                    not entry.name.startswith(own)):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    # Still open in another running instance on systems that lock it
+                    pass
+
+    def dump_loop(self):
+        """Background thread: set up the ring and turn trigger requests into clip files"""
+        self.remove_stale_rings()
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+            if request[0] == "allocate":
+                self.allocate(request[1])
+                continue
+            _, label, timestamp = request
+            # Wait until the frames after the trigger are in the ring too
+            delay = timestamp + self.after - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            path = self.dump(label, timestamp)
+            if path is not None:
+                self.clips_saved += 1
+                self.prune()
+                if self.on_saved is not None:
+                    self.on_saved(path)
+
+    def prune(self):
+        """Delete the oldest clips beyond max_clips or max_bytes"""
+        try:
+            clips = [entry for entry in os.scandir(self.directory)
+                     if entry.is_file() and entry.name.endswith(".avi")]
+            clips = sorted(clips, key=lambda entry: entry.stat().st_mtime, reverse=True)
+            total = 0
+            for count, entry in enumerate(clips):
+                total += entry.stat().st_size
+                if count >= self.max_clips or total > self.max_bytes:
+                    os.remove(entry.path)
+        except OSError:
+            pass
+
+    def dump(self, label, timestamp):
+        """Write the frames around timestamp to a new clip; return its path or None"""
+        with self.lock:
+            frames = self.frames
+            stamps = self.timestamps.copy()
+        if frames is None:
+            return None
+        selected = np.flatnonzero((stamps >= timestamp - self.before) &
+                                  (stamps <= timestamp + self.after))
+        if not len(selected):
+            return None
+        selected = selected[np.argsort(stamps[selected])]
+        frames = frames[selected]
+
+        name = "".join(c if c.isalnum() else "_" for c in label).strip("_") or "clip"
+        now = time.time()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{int(now * 1000) % 1000:03d}"
+        path = os.path.join(self.directory, f"{stamp}-{name}.avi")
+        # Two triggers can still land in the same millisecond
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self.directory, f"{stamp}-{name}-{suffix}.avi")
+        height, width = frames.shape[1:3]
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), self.fps, (width, height))
+        try:
+            for frame in frames:
+                writer.write(frame)
+        finally:
+            writer.release()
+        return path
+
+    def close(self):
+        """Stop the dump thread after pending clips and delete the ring file"""
+        if self.thread is not None:
+            self.requests.put(None)
+            self.thread.join(self.after + 5.0)
+            self.thread = None
+        self.pending_size = None
+        if self.frames is not None:
+            frames = self.frames
+            self.frames = None
+            remove_ring(frames)
@@ -0,0 +1,237 @@
+import json
+import os
+import re
+
+from keyword_spotter import COMMANDS
+
+# Where user-defined aliases and macros are stored
+ALIASES_PATH = os.path.join(os.path.expanduser("~"), ".gaminator", "voice_aliases.json")
+
+# Other ways of saying each built-in command
+DEFAULT_ALIASES = {
+    "launch browser": "Open Browser",
+    "start web browser": "Open Browser",
+    "open web": "Open Browser",
+    "louder": "Volume Up",
+    "turn volume up": "Volume Up",
+    "increase volume": "Volume Up",
+    "close this window": "Close Window",
+    "close app": "Close Window",
+    "scroll page down": "Scroll Down",
+    "page down": "Scroll Down",
+    "next page": "Next Slide",
+    "forward slide": "Next Slide",
+}
+
+# Filler words that carry no meaning for command matching
+STOPWORDS = {"a", "an", "the", "please", "my", "this", "that", "to", "can", "you", "now", "and"}
+
+# Marks the end of a word in the trie
+END = None
+
+
+def tokenize(text):
+    """Lower-case words of text, without filler words"""
+    return [word for word in re.findall(r"[a-z0-9']+", text.lower()) if word not in STOPWORDS]
+
+
+def bigrams(word):
+    """Distinct character pairs of a word, with its start and end marked"""
+    padded = f"^{word}$"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def bounded_distance(a, b, bound):
+    """Levenshtein distance between a and b, or None as soon as it must exceed bound"""
+    if abs(len(a) - len(b)) > bound:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        row = [i]
+        for j in range(1, len(b) + 1):
+            row.append(min(row[j - 1] + 1, previous[j] + 1, previous[j - 1] + (char != b[j - 1])))
+        # Cells never shrink further down the table, so the bound is already lost
+        if min(row) > bound:
+            return None
+        previous = row
+    return previous[-1] if previous[-1] <= bound else None
+
+
+def edit_bound(word):
+    """Most edits allowed when matching a word of this length"""
+    if len(word) < 2:
+        return 0
+    return 1 if len(word) <= 4 else 2
+
+
+class CommandMatcher:
+    """Maps recognized text to a command through fuzzy phrase matching
+
+    Every word of every command name, alias and macro phrase goes into a
+    trie and into a character bigram index, and an inverted index maps
+    words and word pairs back to the phrases that contain them. A query
+    word is first looked up exactly in the trie. Otherwise the bigram index
+    yields the few words sharing enough character pairs to be within the
+    word's edit bound, and only those are checked with an edit distance
+    that gives up as soon as the bound is exceeded. The phrases found
+    through the inverted index are scored by how much of the phrase was
+    matched, how much of the query was used and whether word pairs appear
+    in the same order.
+    """
+    def __init__(self, commands=COMMANDS, path=ALIASES_PATH, min_score=0.65):
+        self.commands = list(commands)
+        self.path = path
+        self.min_score = min_score
+        self.aliases = None
+        self.phrases = []
+        self.trie = {}
+        self.gram_index = {}
+        self.postings = {}
+        self.pair_postings = {}
+        # Recent word lookups, since transcripts repeat the same few words
+        self.lookups = {}
+        self.dirty = True
+
+    def load(self):
+        """Read the user's aliases once; a missing or corrupt file means none"""
+        if self.aliases is None:
+            try:
+                with open(self.path) as f:
+                    self.aliases = dict(json.load(f))
+            except (OSError, ValueError, TypeError):
+                self.aliases = {}
+        return self.aliases
+
+    def save(self):
+        """Write the user's aliases"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.load(), f, indent=2)
+
+    def add_alias(self, phrase, command):
+        """Make phrase trigger command (a built-in command or any macro name)"""
+        self.load()[phrase.strip()] = command
+        self.dirty = True
+
+    def remove_alias(self, phrase):
+        """Forget a user alias; return True if it existed"""
+        if self.load().pop(phrase.strip(), None) is None:
+            return False
+        self.dirty = True
+        return True
+
+    def build(self):
+        """Rebuild the trie and the inverted index from all phrases"""
+        entries = {command: command for command in self.commands}
+        entries.update(DEFAULT_ALIASES)
+        entries.update(self.load())
+        self.phrases = []
+        self.trie = {}
+        self.gram_index = {}
+        self.postings = {}
+        self.pair_postings = {}
+        self.lookups = {}
+        for phrase, command in entries.items():
+            words = tokenize(phrase)
+            if not words:
+                continue
+            index = len(self.phrases)
+            self.phrases.append((phrase, command, len(words)))
+            for position, word in enumerate(words):
+                self.insert(word)
+                self.postings.setdefault(word, []).append((index, position))
+            for pair in zip(words, words[1:]):
+                self.pair_postings.setdefault(pair, []).append(index)
+        self.dirty = False
+
+    def insert(self, word):
+        """Add a word to the trie and the bigram index"""
+        node = self.trie
+        for char in word:
+            node = node.setdefault(char, {})
+        if END not in node:
+            node[END] = word
+            for gram in bigrams(word):
+                self.gram_index.setdefault(gram, []).append(word)
+
+    def contains(self, word):
+        """Whether the word is indexed, found by walking the trie"""
+        node = self.trie
+        for char in word:
+            node = node.get(char)
+            if node is None:
+                return False
+        return END in node
+
+    def lookup(self, word):
+        """Return {indexed word: edit distance} for words within the word's edit bound"""
+        found = self.lookups.get(word)
+        if found is not None:
+            return found
+        if self.contains(word):
+            # An exact word always scores best, so no need to look further
+            found = {word: 0}
+        else:
+            found = {}
+            bound = edit_bound(word)
+            grams = bigrams(word)
+            # Each edit destroys at most two of the word's character pairs
+            needed = max(1, len(grams) - 2 * bound)
+            shared = {}
+            for gram in grams:
+                for indexed in self.gram_index.get(gram, ()):
+                    shared[indexed] = shared.get(indexed, 0) + 1
+            for indexed, count in shared.items():
+                if count >= needed:
+                    distance = bounded_distance(word, indexed, bound)
+                    if distance is not None:
+                        found[indexed] = distance
+        if len(self.lookups) > 4096:
+            self.lookups.clear()
+        self.lookups[word] = found
+        return found
+
+    def match(self, text):
+        """Return (command or None, score, matched phrase or None) for recognized text"""
+        if self.dirty:
+            self.build()
+        words = tokenize(text)
+        if not words:
+            return None, 0.0, None
+
+        # Best similarity per phrase position, and which query words were used
+        similarities = {}
+        used = {}
+        candidates = []
+        for query_index, word in enumerate(words):
+            found = self.lookup(word)
+            candidates.append(found)
+            for indexed, distance in found.items():
+                similarity = 1.0 - distance / max(len(indexed), len(word))
+                for phrase, position in self.postings[indexed]:
+                    best = similarities.setdefault(phrase, {})
+                    if similarity > best.get(position, 0.0):
+                        best[position] = similarity
+                    used.setdefault(phrase, set()).add(query_index)
+
+        ordered = {}
+        for first, second in zip(candidates, candidates[1:]):
+            for pair in ((a, b) for a in first for b in second):
+                for phrase in self.pair_postings.get(pair, ()):
+                    ordered[phrase] = ordered.get(phrase, 0) + 1
+
+        best_phrase, best_score = None, 0.0
+        for phrase, positions in similarities.items():
+            length = self.phrases[phrase][2]
+            recall = sum(positions.values()) / length
+            precision = len(used[phrase]) / len(words)
+            order = min(1.0, ordered.get(phrase, 0) / (length - 1)) if length > 1 else 1.0
+            score = 0.7 * recall + 0.15 * precision + 0.15 * order
+            if score > best_score or (score == best_score and best_phrase is not None and
+                                      length < self.phrases[best_phrase][2]):
+                best_phrase, best_score = phrase, score
+
+        if best_phrase is None or best_score < self.min_score:
+            return None, best_score, None
+        phrase, command, _ = self.phrases[best_phrase]
+        return command, best_score, phrase
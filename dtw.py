@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def envelopes(templates, radius):
+    """Return the (lower, upper) LB_Keogh envelopes of (n, length, dims) templates"""
+    length = templates.shape[1]
+    # Sliding min/max over a window of 2 * radius + 1, clamped at the ends
+    index = np.clip(np.arange(length)[:, None] + np.arange(-radius, radius + 1)[None, :],
+                    0, length - 1)
+    windows = templates[:, index]
+    return windows.min(axis=2), windows.max(axis=2)
+
+
+def lb_keogh(query, lower, upper):
+    """LB_Keogh lower bounds of the DTW cost between query and every template"""
+    excess = np.maximum(query - upper, 0) + np.maximum(lower - query, 0)
+    return (excess ** 2).sum(axis=(1, 2))
+
+
+def dtw_costs(query, templates, radius):
+    """Banded DTW cost between query (length, dims) and a batch of templates
+
+    The cost of a point pair is their squared distance. The dynamic program
+    runs one anti-diagonal at a time, because every cell on a diagonal only
+    depends on the two diagonals before it, so each step is a single NumPy
+    operation over all cells and all templates in the batch.
+    """
+    count, length = templates.shape[:2]
+    cost = ((query[None, :, None, :] - templates[:, None, :, :]) ** 2).sum(axis=3)
+    table = np.full((count, length + 1, length + 1), np.inf, np.float32)
+    table[:, 0, 0] = 0.0
+    for diagonal in range(2, 2 * length + 1):
+        i = np.arange(max(1, diagonal - length), min(length, diagonal - 1) + 1)
+        j = diagonal - i
+        band = np.abs(i - j) <= radius
+        i, j = i[band], j[band]
+        if not len(i):
+            continue
+        best = np.minimum(np.minimum(table[:, i - 1, j], table[:, i, j - 1]),
+                          table[:, i - 1, j - 1])
+        table[:, i, j] = cost[:, i - 1, j - 1] + best
+    return table[:, length, length]
@@ -0,0 +1,110 @@
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QImage, QPainter, QColor
+
+
+def fit_rect(image_width, image_height, bounds):
+    """Return the largest rect with the image aspect ratio centered in bounds"""
+    if image_width <= 0 or image_height <= 0:
+        return QRect(bounds)
+    scale = min(bounds.width() / image_width, bounds.height() / image_height)
+    width = int(image_width * scale)
+    height = int(image_height * scale)
+    x = bounds.x() + (bounds.width() - width) // 2
+    y = bounds.y() + (bounds.height() - height) // 2
+    return QRect(x, y, width, height)
+
+
+class FrameBuffer:
+    """Preallocated RGB buffer with a persistent QImage wrapping its memory
+
+    Each BGR camera frame is converted straight into the same RGB array with
+    cvtColor's dst argument, so nothing is allocated per frame. The buffer and
+    its QImage are only rebuilt when the frame resolution changes.
+    """
+    def __init__(self):
+        self.rgb = None
+        self.image = None
+        self.frames = 0
+        self.bytes_allocated = 0
+        self.last_frame_bytes = 0
+
+    def update(self, frame):
+        """Convert a BGR frame into the buffer; return True if it was reallocated"""
+        height, width = frame.shape[:2]
+        reallocated = self.rgb is None or self.rgb.shape[:2] != (height, width)
+        if reallocated:
+            self.rgb = np.empty((height, width, 3), np.uint8)
+            self.image = QImage(self.rgb.data, width, height, 3 * width, QImage.Format_RGB888)
+            self.last_frame_bytes = self.rgb.nbytes
+        else:
+            self.last_frame_bytes = 0
+
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self.rgb)
+        self.frames += 1
+        self.bytes_allocated += self.last_frame_bytes
+        return reallocated
+
+    def bytes_per_frame(self):
+        """Average number of display bytes allocated per frame so far"""
+        if not self.frames:
+            return 0.0
+        return self.bytes_allocated / self.frames
+
+    def reset(self):
+        """Drop the buffer and start counting again"""
+        self.rgb = None
+        self.image = None
+        self.frames = 0
+        self.bytes_allocated = 0
+        self.last_frame_bytes = 0
+
+
+class FrameView(QWidget):
+    """Widget that paints camera frames from a FrameBuffer without per-frame pixmaps"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = FrameBuffer()
+        self.text = ""
+        self.target_rect = QRect()
+        self.show_frame = False
+        # Optional vector overlay (e.g. a HandOverlay) painted over the frame
+        self.overlay = None
+
+    def setText(self, text):
+        """Show a placeholder message instead of the camera feed"""
+        self.text = text
+        self.show_frame = False
+        self.update()
+
+    def setFrame(self, frame):
+        """Display a BGR frame"""
+        if self.buffer.update(frame) or not self.show_frame:
+            self.show_frame = True
+            self.update_target_rect()
+        self.update()
+
+    def update_target_rect(self):
+        """Recompute where the frame is drawn; only needed on resize or new resolution"""
+        if self.buffer.image is not None:
+            self.target_rect = fit_rect(self.buffer.image.width(), self.buffer.image.height(), self.rect())
+
+    def resizeEvent(self, event):
+        """Rescale the frame only when the widget size changes"""
+        self.update_target_rect()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        """Draw the current frame or the placeholder text"""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(34, 34, 34))
+        if self.show_frame and self.buffer.image is not None:
+            image = self.buffer.image
+            painter.drawImage(self.target_rect, image)
+            if self.overlay is not None:
+                self.overlay.paint(painter, self.target_rect, image.width(), image.height())
+        else:
+            painter.setPen(QColor(200, 200, 200))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.text)
@@ -0,0 +1,99 @@
+import math
+
+
+class FrameScheduler:
+    """Paces GUI frame processing to hold a target frame rate
+
+    The scheduler keeps running averages of the camera's real frame interval
+    and of what a frame costs to display and to run through detection. From
+    those it picks how often detection runs (every Nth frame) and the minimum
+    interval between frames the GUI takes from the capture ring. When the
+    pipeline cannot keep up, detection is thinned out first; the display rate
+    only drops once detection is already at its sparsest.
+    """
+    def __init__(self, target_fps=30.0, max_detect_stride=6, smoothing=0.1):
+        self.max_detect_stride = max_detect_stride
+        self.smoothing = smoothing
+        self.set_target_fps(target_fps)
+        self.reset()
+
+    def set_target_fps(self, fps):
+        """Change the frame rate the scheduler aims for"""
+        self.target_fps = max(1.0, float(fps))
+        self.target_interval = 1.0 / self.target_fps
+
+    def reset(self):
+        """Forget all measurements"""
+        self.camera_interval = self.target_interval
+        self.display_cost = 0.0
+        self.detect_cost = 0.0
+        self.detect_stride = 1
+        self.poll_interval = self.target_interval
+        self.last_capture = None
+        self.last_published = 0
+        self.last_consume = -math.inf
+        self.frames = 0
+        self.detected = 0
+
+    def smooth(self, average, sample):
+        """Exponential moving average step"""
+        return average + self.smoothing * (sample - average)
+
+    def observe_capture(self, timestamp, published):
+        """Record the capture time of the newest frame and the camera's frame count
+
+        Frames dropped between two observations are accounted for through
+        the published count, so the interval is the camera's, not the GUI's.
+        """
+        if self.last_capture is not None:
+            frames = published - self.last_published
+            if frames > 0 and timestamp > self.last_capture:
+                self.camera_interval = self.smooth(self.camera_interval,
+                                                   (timestamp - self.last_capture) / frames)
+        self.last_capture = timestamp
+        self.last_published = published
+
+    def poll_delay(self, now):
+        """Seconds to wait before taking the next frame (0 if it can be taken now)"""
+        return max(0.0, self.last_consume + self.poll_interval - now)
+
+    def begin_frame(self, now):
+        """Start processing a frame; return True if detection should run on it"""
+        self.last_consume = now
+        self.frames += 1
+        detect = self.frames % self.detect_stride == 0
+        if detect:
+            self.detected += 1
+        return detect
+
+    def end_frame(self, display_cost, detect_cost=None):
+        """Record what the frame cost (in seconds) and adapt the schedule"""
+        self.display_cost = self.smooth(self.display_cost, display_cost)
+        if detect_cost is not None:
+            self.detect_cost = self.smooth(self.detect_cost, detect_cost)
+        self.adapt()
+
+    def adapt(self):
+        """Pick the detection stride and polling interval from the measurements"""
+        budget = max(self.target_interval, self.camera_interval)
+        headroom = budget - self.display_cost
+        if headroom <= 0:
+            stride = self.max_detect_stride
+        else:
+            stride = math.ceil(self.detect_cost / headroom) if self.detect_cost > 0 else 1
+        self.detect_stride = max(1, min(self.max_detect_stride, stride))
+
+        # Only slow the display down once detection cannot be thinned any further.
+        # The small slack keeps capture jitter from pushing frames to the next tick.
+        frame_cost = self.display_cost + self.detect_cost / self.detect_stride
+        self.poll_interval = max(0.9 * self.target_interval, frame_cost)
+
+    def detect_ratio(self):
+        """Fraction of displayed frames that ran detection"""
+        if not self.frames:
+            return 0.0
+        return self.detected / self.frames
+
+    def effective_fps(self):
+        """Frame rate the GUI can currently sustain"""
+        return 1.0 / max(self.poll_interval, self.camera_interval)
@@ -0,0 +1,230 @@
+import time
+
+import cv2
+import numpy as np
+
+from camera_profiles import CameraProfileCache
+
+
+class FrameSource:
+    """Base class for anything that produces BGR frames for the gesture pipeline"""
+
+    # True for sources that deliver frames in real time (cameras)
+    live = False
+
+    def open(self):
+        """Prepare the source; return True on success"""
+        return True
+
+    def read(self, frame=None):
+        """Return (ok, frame), reusing the frame buffer when possible"""
+        raise NotImplementedError
+
+    def release(self):
+        """Free any resources held by the source"""
+
+    def describe(self):
+        """Short human-readable name for reports"""
+        return type(self).__name__
+
+
+class CameraSource(FrameSource):
+    """Live camera opened with cv2.VideoCapture
+
+    The camera's capture mode comes from the shared profile cache: probed on
+    first use, then applied immediately on every later open.
+    """
+
+    live = True
+
+    # Shared by all camera sources in the process; None keeps driver defaults
+    profile_cache = CameraProfileCache()
+
+    def __init__(self, device=0):
+        self.device = device
+        self.cap = None
+        self.profile = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.device)
+        if not self.cap.isOpened():
+            self.release()
+            return False
+        if self.profile_cache is not None:
+            self.profile = self.profile_cache.configure(self.device, self.cap)
+        return True
+
+    def read(self, frame=None):
+        if self.cap is None:
+            return False, frame
+        return self.cap.read(frame)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def describe(self):
+        if self.profile:
+            profile = self.profile
+            return (f"camera {self.device} ({profile['width']}x{profile['height']} "
+                    f"{profile['fourcc']} @ {profile['fps']} fps)")
+        return f"camera {self.device}"
+
+
+class VideoFileSource(FrameSource):
+    """Video file in any format cv2.VideoCapture can decode
+
+    With realtime set, frames are paced at the file's own frame rate so the
+    file behaves like a camera; otherwise frames are delivered as fast as
+    they decode. With loop set, playback restarts at the end of the file.
+    """
+
+    def __init__(self, path, loop=False, realtime=False):
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.cap = None
+        self.interval = 0.0
+        self.next_time = 0.0
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            self.release()
+            return False
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.interval = 1.0 / fps if fps > 0 else 1.0 / 30
+        self.next_time = time.monotonic()
+        return True
+
+    def read(self, frame=None):
+        if self.cap is None:
+            return False, frame
+        if self.realtime:
+            delay = self.next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_time = max(self.next_time + self.interval, time.monotonic() - self.interval)
+
+        ok, frame = self.cap.read(frame)
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read(frame)
+        return ok, frame
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+    def describe(self):
+        return f"file {self.path}"
+
+
+class SyntheticSource(FrameSource):
+    """Generates frames with moving hand-like skin blobs, for headless runs
+
+    Each hand is a palm disc with spread fingers that sweeps across the frame
+    on its own path. Frames are drawn into the caller's buffer, so a long run
+    allocates nothing per frame.
+    """
+
+    SKIN_COLOR = (150, 170, 220)
+    BACKGROUND_COLOR = (40, 60, 40)
+
+    def __init__(self, width=640, height=480, hands=1, fps=None, frames=None, seed=0):
+        self.width = width
+        self.height = height
+        self.hands = hands
+        self.fps = fps
+        self.frames = frames
+        rng = np.random.default_rng(seed)
+        self.phases = rng.uniform(0, 2 * np.pi, hands)
+        self.speeds = rng.uniform(0.02, 0.05, hands)
+        self.background = np.empty((height, width, 3), np.uint8)
+        self.background[:] = self.BACKGROUND_COLOR
+        # Finger directions, fanned out above the palm
+        angles = np.deg2rad(np.linspace(-150, -30, 5))
+        self.finger_dirs = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+        self.index = 0
+        self.next_time = 0.0
+
+    def open(self):
+        self.index = 0
+        self.next_time = time.monotonic()
+        return True
+
+    def read(self, frame=None):
+        if self.frames is not None and self.index >= self.frames:
+            return False, frame
+        if self.fps:
+            delay = self.next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_time += 1.0 / self.fps
+
+        if frame is None or frame.shape != self.background.shape:
+            frame = np.empty_like(self.background)
+        np.copyto(frame, self.background)
+
+        scale = min(self.width, self.height) / 480
+        palm = int(50 * scale)
+        finger_length = 120 * scale
+        finger_width = max(1, int(16 * scale))
+        t = self.index * self.speeds + self.phases
+        centers = np.stack([
+            (0.5 + 0.35 * np.sin(t)) * self.width,
+            (0.6 + 0.1 * np.sin(1.7 * t)) * self.height,
+        ], axis=1)
+        for cx, cy in centers:
+            tips = np.array([cx, cy]) + finger_length * self.finger_dirs
+            center = (int(cx), int(cy))
+            cv2.circle(frame, center, palm, self.SKIN_COLOR, -1)
+            for tx, ty in tips:
+                cv2.line(frame, center, (int(tx), int(ty)), self.SKIN_COLOR, finger_width)
+
+        self.index += 1
+        return True, frame
+
+    def describe(self):
+        return f"synthetic {self.width}x{self.height}, {self.hands} hand(s)"
+
+
+def make_source(device):
+    """Return a FrameSource for a camera index, a video file path or a source"""
+    if isinstance(device, FrameSource):
+        return device
+    if isinstance(device, str):
+        return VideoFileSource(device, realtime=True)
+    return CameraSource(device)
+
+
+def read_frames(source, stop_event, report, frame=None, max_failures=50):
+    """Yield (frame, time) from an open source until stop_event is set
+
+    Short read failures are retried; after max_failures in a row the camera
+    is reported as stopped and the generator ends. The frame rate is
+    reported about once a second. report(kind, value) receives both.
+    """
+    frames = 0
+    failures = 0
+    window_start = time.monotonic()
+    while not stop_event.is_set():
+        ret, frame = source.read(frame)
+        if not ret:
+            failures += 1
+            if failures >= max_failures:
+                report("error", "Camera stopped delivering frames")
+                return
+            time.sleep(0.01)
+            continue
+        failures = 0
+
+        now = time.monotonic()
+        yield frame, now
+        frames += 1
+        if now - window_start >= 1.0:
+            report("fps", frames / (now - window_start))
+            frames = 0
+            window_start = now
@@ -2,13 +2,14 @@
 import sys
 from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QEvent
 
 from home_view import HomeView
 from voice_command_view import VoiceCommandView
 from gesture_control_view import GestureControlView
 from dashboard_view import DashboardView
 from settings_view import SettingsView
+from camera_manager import camera_manager
 
 class Gaminator(QMainWindow):
     def __init__(self):
@@ -34,6 +35,32 @@ class Gaminator(QMainWindow):
         self.dashboard_view.navigate_signal.connect(self.navigate_to)
         self.settings_view.navigate_signal.connect(self.navigate_to)
         
+        # Apply settings that drive voice input
+        self.settings_view.mic_sensitivity.valueChanged.connect(
+            self.voice_command_view.set_mic_sensitivity)
+        self.voice_command_view.set_mic_sensitivity(self.settings_view.mic_sensitivity.value())
+        self.settings_view.continuous_listening.toggled.connect(
+            self.voice_command_view.set_continuous_listening)
+        
+        # Apply settings that drive the gesture pipeline
+        self.settings_view.gesture_sensitivity.valueChanged.connect(
+            self.gesture_control_view.set_detection_sensitivity)
+        self.gesture_control_view.set_detection_sensitivity(
+            self.settings_view.gesture_sensitivity.value())
+        self.settings_view.camera_select.currentIndexChanged.connect(
+            self.gesture_control_view.set_camera_source)
+        self.settings_view.show_skeleton.toggled.connect(
+            self.gesture_control_view.set_show_skeleton)
+        self.gesture_control_view.set_show_skeleton(self.settings_view.show_skeleton.isChecked())
+        self.settings_view.capture_process.toggled.connect(
+            self.gesture_control_view.set_process_capture)
+        self.settings_view.gesture_clips.toggled.connect(
+            self.gesture_control_view.set_gesture_clips)
+        self.gesture_control_view.set_gesture_clips(self.settings_view.gesture_clips.isChecked())
+        self.settings_view.run_bg.toggled.connect(
+            self.gesture_control_view.set_run_in_background)
+        self.gesture_control_view.set_run_in_background(self.settings_view.run_bg.isChecked())
+        
         # Add views to stacked widget
         self.stacked_widget.addWidget(self.home_view)
         self.stacked_widget.addWidget(self.voice_command_view)
@@ -44,6 +71,10 @@ class Gaminator(QMainWindow):
         # Set the initial view to home
         self.stacked_widget.setCurrentWidget(self.home_view)
         
+        # Let views throttle their work while they are off screen
+        self.stacked_widget.currentChanged.connect(self.update_view_activity)
+        self.update_view_activity()
+        
         # Set dark theme
         self.setStyleSheet("""
             QMainWindow, QWidget {
@@ -107,6 +138,29 @@ class Gaminator(QMainWindow):
         elif view_name == "settings":
             self.stacked_widget.setCurrentWidget(self.settings_view)
 
+    def update_view_activity(self):
+        """Tell every view whether it is currently on screen"""
+        current = self.stacked_widget.currentWidget()
+        minimized = bool(self.windowState() & Qt.WindowMinimized)
+        for index in range(self.stacked_widget.count()):
+            view = self.stacked_widget.widget(index)
+            view.set_view_active(view is current and not minimized)
+
+    def changeEvent(self, event):
+        """Pause on-screen work while the window is minimized"""
+        if event.type() == QEvent.WindowStateChange:
+            self.update_view_activity()
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        """Stop capture, audio and recognition, and release every camera, including warm ones"""
+        self.voice_command_view.stop_audio()
+        self.voice_command_view.recognizer.stop()
+        self.gesture_control_view.stop_capture()
+        self.gesture_control_view.clip_recorder.close()
+        camera_manager.shutdown()
+        super().closeEvent(event)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Use Fusion style for a more modern look
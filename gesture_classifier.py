@@ -0,0 +1,175 @@
+import numpy as np
+
+# One entry per processed frame: timestamp, hand centroid and box size (all
+# normalized to the frame size) and the number of fingertips seen
+TRAJECTORY_DTYPE = np.dtype([
+    ("t", "f8"),
+    ("cx", "f4"),
+    ("cy", "f4"),
+    ("w", "f4"),
+    ("h", "f4"),
+    ("fingers", "i2"),
+    ("valid", "?"),
+])
+
+
+class TrajectoryRing:
+    """Fixed-size ring of recent hand observations in a NumPy structured array"""
+    def __init__(self, size=64):
+        self.size = size
+        self.data = np.zeros(size, TRAJECTORY_DTYPE)
+        self.index = 0
+        self.count = 0
+        # Chronological gather indices for every possible write position
+        self.orders = (np.arange(size)[None, :] + np.arange(size)[:, None]) % size
+
+    def push(self, timestamp, cx=0.0, cy=0.0, w=0.0, h=0.0, fingers=0, valid=False):
+        """Append one observation, overwriting the oldest when full"""
+        self.data[self.index] = (timestamp, cx, cy, w, h, fingers, valid)
+        self.index = (self.index + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def ordered(self):
+        """Return the stored observations oldest first"""
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.orders[self.index]]
+
+    def clear(self):
+        """Drop all observations"""
+        self.index = 0
+        self.count = 0
+
+
+class GestureClassifier:
+    """Classifies swipes, pinch zoom and open palm from a hand trajectory
+
+    Features are computed with NumPy over a fixed-size window of recent
+    observations, so the cost per frame does not depend on how long a hand
+    has been tracked. When a hand leaves after tracing a path, the path is
+    also matched against the user's recorded gesture templates, if any.
+    """
+
+    SWIPE_LEFT = "Swipe Left"
+    SWIPE_RIGHT = "Swipe Right"
+    PINCH_ZOOM_IN = "Pinch Zoom In"
+    PINCH_ZOOM_OUT = "Pinch Zoom Out"
+    OPEN_PALM = "Open Palm"
+
+    def __init__(self, window=0.6, palm_hold=0.5, cooldown=0.8, mirrored=True):
+        self.ring = TrajectoryRing()
+        self.window = window
+        self.palm_hold = palm_hold
+        self.cooldown = cooldown
+        # Camera images are not mirrored, so the user's right is image left
+        self.mirrored = mirrored
+        self.swipe_distance = 0.25
+        self.swipe_consistency = 0.7
+        self.zoom_ratio = 1.5
+        self.zoom_drift = 0.1
+        self.palm_fingers = 4
+        # Optional GestureTemplateLibrary of user-recorded gestures
+        self.templates = None
+        self.min_stroke_points = 8
+        self.min_stroke_extent = 0.1
+        # While recording a new gesture, strokes are reported but nothing is classified
+        self.recording = False
+        self.reset()
+
+    def reset(self):
+        """Forget the trajectory and any cooldown"""
+        self.ring.clear()
+        self.blocked_until = 0.0
+        self.palm_latched = False
+        self.stroke_points = 0
+        # (n, 2) path of the hand's last stroke in normalized frame coordinates,
+        # set only on the frame where the stroke ended
+        self.last_stroke = None
+
+    def update(self, timestamp, detection, frame_width, frame_height):
+        """Add an observation; return a gesture name when one completes, else None"""
+        self.last_stroke = None
+        if detection is None:
+            # The hand just left: its path since it appeared is one stroke
+            if self.stroke_points >= self.min_stroke_points:
+                track = self.ring.ordered()[-self.stroke_points:]
+                self.last_stroke = np.stack([track["cx"], track["cy"]], axis=1)
+            self.stroke_points = 0
+            self.ring.push(timestamp)
+        else:
+            self.stroke_points = min(self.stroke_points + 1, self.ring.size)
+            x, y, w, h = detection.box
+            self.ring.push(timestamp,
+                           detection.centroid[0] / frame_width,
+                           detection.centroid[1] / frame_height,
+                           w / frame_width, h / frame_height,
+                           len(detection.fingertips), True)
+
+        # An open palm only fires again once the hand has closed or left
+        if self.palm_latched and (detection is None or len(detection.fingertips) < self.palm_fingers):
+            self.palm_latched = False
+
+        if self.recording or timestamp < self.blocked_until:
+            return None
+
+        gesture = self.classify(timestamp)
+        if gesture is None and self.last_stroke is not None:
+            gesture = self.match_stroke(self.last_stroke)
+        if gesture == self.OPEN_PALM:
+            if self.palm_latched:
+                return None
+            self.palm_latched = True
+        if gesture is not None:
+            # Start the next gesture from a clean trajectory
+            self.ring.clear()
+            self.stroke_points = 0
+            self.blocked_until = timestamp + self.cooldown
+        return gesture
+
+    def match_stroke(self, stroke):
+        """Return the name of the recorded gesture matching a stroke, or None"""
+        if self.templates is None or np.ptp(stroke, axis=0).max() < self.min_stroke_extent:
+            return None
+        match = self.templates.match(stroke)
+        return match[0] if match is not None else None
+
+    def classify(self, now):
+        """Classify the recent trajectory"""
+        data = self.ring.ordered()
+        recent = data[data["t"] >= now - max(self.window, self.palm_hold)]
+        track = recent[recent["valid"]]
+        if len(track) < 3:
+            return None
+
+        # Open palm: every recent observation shows a spread hand
+        held = recent[recent["t"] >= now - self.palm_hold]
+        if (len(held) >= 3 and held["valid"].all() and
+                held["t"][-1] - held["t"][0] >= 0.8 * self.palm_hold and
+                (held["fingers"] >= self.palm_fingers).all()):
+            return self.OPEN_PALM
+
+        track = track[track["t"] >= now - self.window]
+        if len(track) < 3:
+            return None
+
+        dx = track["cx"][-1] - track["cx"][0]
+        dy = track["cy"][-1] - track["cy"][0]
+        steps = np.diff(track["cx"])
+
+        # Swipe: a long, mostly horizontal, one-directional movement
+        if abs(dx) > self.swipe_distance and abs(dx) > 2 * abs(dy):
+            consistency = np.mean(np.sign(steps) == np.sign(dx))
+            if consistency >= self.swipe_consistency:
+                rightward = (dx < 0) if self.mirrored else (dx > 0)
+                return self.SWIPE_RIGHT if rightward else self.SWIPE_LEFT
+
+        # Pinch zoom: the hand grows or shrinks without moving much
+        area = track["w"] * track["h"]
+        if area[0] > 0 and np.hypot(dx, dy) < self.zoom_drift:
+            ratio = area[-1] / area[0]
+            if ratio > self.zoom_ratio:
+                return self.PINCH_ZOOM_IN
+            if ratio < 1 / self.zoom_ratio:
+                return self.PINCH_ZOOM_OUT
+
+        return None
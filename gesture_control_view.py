@@ -1,11 +1,24 @@
+import os
+import time
 
-import cv2
 import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
-                             QHBoxLayout, QListWidget, QListWidgetItem)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
-from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor
+                             QHBoxLayout, QListWidget, QListWidgetItem, QShortcut,
+                             QInputDialog)
+from PyQt5.QtCore import Qt, QTimer, QRect, pyqtSignal
+from PyQt5.QtGui import QPainter, QPen, QColor, QKeySequence
 from base_view import BaseView
+from camera_capture import CaptureWorker
+from camera_manager import SharedCameraSource, camera_manager
+from clip_recorder import ClipRecorder
+from frame_scheduler import FrameScheduler
+from gesture_pipeline import GesturePipeline
+from gesture_templates import GestureTemplateLibrary
+from latency import LatencyTracker
+from multi_camera import MultiCameraPool
+from shm_transport import ShmCapture
+from hand_overlay import HandOverlay
+from frame_display import FrameBuffer, fit_rect
 
 class HandGestureVisualizer(QWidget):
     """Custom widget for hand gesture visualization"""
@@ -17,16 +30,88 @@ class HandGestureVisualizer(QWidget):
         self.scan_position = 0
         self.scan_timer = QTimer()
         self.scan_timer.timeout.connect(self.update_scan)
+        # Whether the widget is on screen; nothing is animated or uploaded otherwise
+        self.rendering = True
+        self.frame_buffer = FrameBuffer()
+        # QImage on screen: the frame buffer's, or one wrapping shared memory
+        self.image = None
+        self.frame_rect = QRect()
+        self.has_frame = False
+        # Hand box, hull and skeleton, painted as vectors over the frame
+        self.overlay = HandOverlay()
+        
+        # Latency instrumentation: the shown frame's stage stamps are recorded
+        # into the tracker once the frame has actually been painted
+        self.latency_tracker = None
+        self.frame_stamps = None
+        self.show_latency = False
+        self.latency_lines = []
+        # Seconds the last paintEvent took, used by the frame scheduler
+        self.paint_cost = 0.0
         
     def setDetecting(self, detecting):
         """Set detecting state and update visualization"""
         self.is_detecting = detecting
-        if detecting:
+        if detecting and self.rendering:
             self.scan_timer.start(50)
         else:
             self.scan_timer.stop()
+        if not detecting:
+            self.has_frame = False
+            self.image = None
+        self.update()
+        
+    def setRendering(self, rendering):
+        """Start or stop all drawing work, e.g. while the view is hidden"""
+        self.rendering = rendering
+        self.setDetecting(self.is_detecting)
+        
+    def setFrame(self, frame, stamps=None):
+        """Show a BGR camera frame underneath the scanning overlay"""
+        if self.frame_buffer.update(frame) or not self.has_frame:
+            self.has_frame = True
+            self.image = self.frame_buffer.image
+            self.update_frame_rect()
+        self.frame_stamps = stamps
         self.update()
         
+    def setImage(self, image, stamps=None):
+        """Show an RGB QImage as is, e.g. one that wraps shared memory"""
+        resized = self.image is None or image.size() != self.image.size()
+        self.image = image
+        self.has_frame = True
+        if resized:
+            self.update_frame_rect()
+        self.frame_stamps = stamps
+        self.update()
+        
+    def setDetection(self, detection):
+        """Show the detected hand (in frame coordinates) over the frame"""
+        self.overlay.set_detection(detection)
+        
+    def setShowSkeleton(self, show):
+        """Turn the hand overlay on or off"""
+        self.overlay.visible = show
+        self.update()
+        
+    def setLatencyOverlay(self, visible, lines=None):
+        """Show or hide the latency debug overlay"""
+        self.show_latency = visible
+        if lines is not None:
+            self.latency_lines = lines
+        self.update()
+        
+    def update_frame_rect(self):
+        """Recompute the frame's target rect; only needed on resize or new resolution"""
+        image = self.image
+        if image is not None:
+            self.frame_rect = fit_rect(image.width(), image.height(), self.rect())
+            
+    def resizeEvent(self, event):
+        """Rescale the camera frame only when the widget size changes"""
+        self.update_frame_rect()
+        super().resizeEvent(event)
+        
     def update_scan(self):
         """Update scanning animation"""
         self.scan_position = (self.scan_position + 1) % 100
@@ -39,6 +124,7 @@ class HandGestureVisualizer(QWidget):
         
     def paintEvent(self, event):
         """Draw the camera feed placeholder and detection visualization"""
+        paint_start = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
@@ -51,9 +137,14 @@ class HandGestureVisualizer(QWidget):
             painter.drawText(self.rect(), Qt.AlignCenter, "Camera feed not active")
             return
         
-        # Draw active scanning text
-        painter.setPen(QColor(139, 92, 246))
-        painter.drawText(self.rect(), Qt.AlignCenter, "Scanning for hand gestures...")
+        # Draw the latest camera frame, or the scanning text until one arrives
+        if self.has_frame:
+            image = self.image
+            painter.drawImage(self.frame_rect, image)
+            self.overlay.paint(painter, self.frame_rect, image.width(), image.height())
+        else:
+            painter.setPen(QColor(139, 92, 246))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Scanning for hand gestures...")
         
         # Draw scanning line
         scan_y = int(self.height() * (self.scan_position / 100))
@@ -91,17 +182,106 @@ class HandGestureVisualizer(QWidget):
                 else:
                     painter.drawLine(x + corner_size, y + corner_size, x + corner_size//2, y + corner_size)
                     painter.drawLine(x + corner_size, y + corner_size, x + corner_size, y + corner_size//2)
+        
+        # Draw latency debug overlay
+        if self.show_latency and self.latency_lines:
+            font = painter.font()
+            font.setPointSize(8)
+            painter.setFont(font)
+            metrics = painter.fontMetrics()
+            line_height = metrics.height()
+            width = max(metrics.horizontalAdvance(line) for line in self.latency_lines) + 12
+            box = QRect(8, 8, width, line_height * len(self.latency_lines) + 8)
+            painter.fillRect(box, QColor(0, 0, 0, 160))
+            painter.setPen(QColor(220, 220, 220))
+            for i, line in enumerate(self.latency_lines):
+                painter.drawText(box.x() + 6, box.y() + 4 + line_height * (i + 1) - 3, line)
+        
+        # The frame is on screen now; close its latency record
+        if self.frame_stamps is not None and self.latency_tracker is not None:
+            self.frame_stamps["ui"] = time.monotonic()
+            self.latency_tracker.record(self.frame_stamps)
+        self.frame_stamps = None
+        self.paint_cost = time.perf_counter() - paint_start
 
 
 class GestureControlView(BaseView):
     """View for the gesture control functionality"""
     
+    # Emitted with the path of every gesture clip saved to disk
+    clip_saved = pyqtSignal(str)
+    
+    # Number of entries kept in the command history
+    MAX_HISTORY = 100
+    
+    # Camera devices for each "Camera Source" setting, in the order listed
+    CAMERA_SOURCES = [[0], [1], [2], [0, 1]]
+    
+    # Frame rate the scheduler aims for while the view is hidden
+    BACKGROUND_FPS = 10
+    
+    # Fewest seconds between two clips saved automatically on gestures
+    GESTURE_CLIP_INTERVAL = 10.0
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_detecting = False
-        self.camera_timer = QTimer()
-        self.camera_timer.timeout.connect(self.update_camera_feed)
-        self.cap = None
+        self.capture_worker = None
+        self.gesture_pipeline = GesturePipeline()
+        
+        # User-recorded gestures; the template file is read on first match
+        self.gesture_templates = GestureTemplateLibrary()
+        self.gesture_pipeline.classifier.templates = self.gesture_templates
+        self.recording_name = None
+        self.recording_action = ""
+        
+        # Paces frame consumption; a single-shot timer wakes the view when
+        # a frame had to wait for its slot
+        self.target_fps = 30
+        self.frame_scheduler = FrameScheduler(self.target_fps)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setSingleShot(True)
+        self.poll_timer.timeout.connect(self.update_camera_feed)
+        self.camera_devices = self.CAMERA_SOURCES[0]
+        # Optional FrameSource (video file, synthetic) used instead of a camera
+        self.frame_source = None
+        # Keep detecting at reduced cost while the view is hidden
+        self.run_in_background = True
+        self.resume_on_show = False
+        # The camera is pre-opened in the background the first time the view is shown
+        self.camera_warmed = False
+        
+        # Worker processes used when several cameras are active
+        self.camera_pool = MultiCameraPool(self)
+        self.camera_pool.gesture_detected.connect(self.on_pool_gesture)
+        self.camera_pool.fps_updated.connect(self.on_pool_fps)
+        self.camera_pool.camera_error.connect(self.on_pool_error)
+        
+        # Optional capture process that shares frames through shared memory
+        self.process_capture = False
+        self.shm_capture = ShmCapture(self)
+        self.shm_capture.opened.connect(self.on_camera_opened)
+        self.shm_capture.frame_ready.connect(self.update_shared_feed)
+        self.shm_capture.gesture_detected.connect(self.on_shared_gesture)
+        self.shm_capture.fps_updated.connect(self.on_shared_fps)
+        self.shm_capture.capture_error.connect(self.on_shared_error)
+        
+        # Latency histograms, shown as a debug overlay toggled with F3
+        self.latency_tracker = LatencyTracker()
+        self.gesture_visualizer.latency_tracker = self.latency_tracker
+        self.latency_timer = QTimer()
+        self.latency_timer.timeout.connect(self.update_latency_overlay)
+        self.latency_shortcut = QShortcut(QKeySequence("F3"), self)
+        self.latency_shortcut.activated.connect(self.toggle_latency_overlay)
+        
+        # The last seconds of capture, saved as a clip on F9 or, if enabled, on gestures
+        self.clip_recorder = ClipRecorder()
+        self.gesture_clips = False
+        self.last_gesture_clip = None
+        self.clip_recorder.on_saved = self.clip_saved.emit
+        self.clip_saved.connect(self.on_clip_saved)
+        self.clip_shortcut = QShortcut(QKeySequence("F9"), self)
+        self.clip_shortcut.activated.connect(self.save_clip)
         
     def setup_ui(self):
         """Set up the UI components"""
@@ -135,6 +315,9 @@ class GestureControlView(BaseView):
         status_layout.addWidget(status_label)
         status_layout.addWidget(self.status_indicator)
         status_layout.addStretch()
+        self.clip_label = QLabel("")
+        self.clip_label.setStyleSheet("color: #888;")
+        status_layout.addWidget(self.clip_label)
         left_layout.addLayout(status_layout)
         
         # Start/Stop button
@@ -142,8 +325,12 @@ class GestureControlView(BaseView):
         self.toggle_button = QPushButton("Start Camera")
         self.toggle_button.setMinimumHeight(40)
         self.toggle_button.clicked.connect(self.toggle_detection)
+        self.record_button = QPushButton("Record Gesture")
+        self.record_button.setMinimumHeight(40)
+        self.record_button.clicked.connect(self.toggle_recording)
         button_layout.addStretch()
         button_layout.addWidget(self.toggle_button)
+        button_layout.addWidget(self.record_button)
         button_layout.addStretch()
         left_layout.addLayout(button_layout)
         
@@ -198,45 +385,349 @@ class GestureControlView(BaseView):
                 item.setForeground(QColor(255, 0, 0))
             self.command_list.addItem(item)
 
+    def add_command(self, command, status="success"):
+        """Add a recognized gesture to the top of the command history"""
+        item = QListWidgetItem(f"{time.strftime('%I:%M %p')} - {command}")
+        if status == "success":
+            item.setForeground(QColor(0, 200, 0))
+        else:
+            item.setForeground(QColor(255, 0, 0))
+        self.command_list.insertItem(0, item)
+        
+        # Keep the history bounded so adding an entry stays cheap
+        if self.command_list.count() > self.MAX_HISTORY:
+            self.command_list.takeItem(self.command_list.count() - 1)
+
     def toggle_detection(self):
         """Toggle gesture detection on/off"""
         self.is_detecting = not self.is_detecting
         
-        if self.is_detecting:
-            # Start detection
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                self.gesture_visualizer.setDetecting(False)
-                return
-                
+        if self.is_detecting and self.frame_source is None and len(self.camera_devices) > 1:
+            # Several cameras: one capture-and-detect process per camera
+            # The processes open the devices themselves, so no warm handle may hold them
+            camera_manager.close_devices(self.camera_devices)
+            self.camera_pool.start(self.camera_devices, self.gesture_pipeline.pyramid_level)
             self.toggle_button.setText("Stop Camera")
-            self.status_indicator.setText("Active")
-            self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
+            self.status_indicator.setText("Starting...")
+            self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
             self.gesture_visualizer.setDetecting(True)
-            self.camera_timer.start(30)
+        elif self.is_detecting and self.frame_source is None and self.process_capture:
+            # Capture and detect in a separate process, frames come back through shared memory
+            if self.recording_name is not None:
+                self.stop_recording()
+                self.add_command("Gesture recording needs in-process capture", "error")
+            camera_manager.close_devices(self.camera_devices[:1])
+            self.shm_capture.start(self.camera_devices[0], self.gesture_pipeline.pyramid_level)
+            self.toggle_button.setText("Stop Camera")
+            self.status_indicator.setText("Starting...")
+            self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
+        elif self.is_detecting:
+            # Start detection; the device is opened on the capture thread
+            self.gesture_pipeline.reset()
+            self.frame_scheduler.reset()
+            if self.frame_source is not None:
+                source = self.frame_source
+            else:
+                # Borrow the warm handle so a restart does not reopen the device
+                source = SharedCameraSource(self.camera_devices[0])
+            self.capture_worker = CaptureWorker(source, self)
+            self.capture_worker.recorder = self.clip_recorder
+            # The ring file is set up on the recorder's thread, never on the capture thread
+            self.clip_recorder.start()
+            self.capture_worker.opened.connect(self.on_camera_opened)
+            self.capture_worker.frame_ready.connect(self.update_camera_feed)
+            self.capture_worker.finished.connect(self.on_capture_finished)
+            self.capture_worker.finished.connect(self.capture_worker.deleteLater)
+            self.capture_worker.start()
+            
+            self.toggle_button.setText("Stop Camera")
+            self.status_indicator.setText("Starting...")
+            self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
         else:
             # Stop detection
-            self.camera_timer.stop()
-            if self.cap:
-                self.cap.release()
-                self.cap = None
+            if self.recording_name is not None:
+                self.stop_recording()
+            self.stop_capture()
             self.is_detecting = False
             self.toggle_button.setText("Start Camera")
             self.status_indicator.setText("Inactive")
             self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
             self.gesture_visualizer.setDetecting(False)
 
+    def on_camera_opened(self, ok):
+        """Update the UI once the capture thread has tried to open the camera"""
+        if not self.is_detecting:
+            return
+        if not ok:
+            self.toggle_detection()
+            return
+            
+        self.status_indicator.setText("Active")
+        self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
+        self.gesture_visualizer.setDetecting(True)
+
+    def on_capture_finished(self):
+        """Reset the UI if the capture thread stopped on its own (camera lost)"""
+        if self.is_detecting and self.sender() is self.capture_worker:
+            self.toggle_detection()
+
+    def stop_capture(self):
+        """Stop the capture thread or worker processes and release the cameras"""
+        if self.capture_worker:
+            worker = self.capture_worker
+            self.capture_worker = None
+            worker.frame_ready.disconnect(self.update_camera_feed)
+            worker.stop()
+        self.poll_timer.stop()
+        self.camera_pool.stop()
+        # Nothing may still show shared memory once it is unmapped
+        self.gesture_visualizer.setDetecting(False)
+        self.shm_capture.stop()
+
+    def on_pool_gesture(self, camera_id, gesture):
+        """Add a gesture recognized by one of the camera processes"""
+        self.add_command(f"{gesture} (Camera {camera_id + 1})")
+
+    def on_pool_fps(self, camera_id, fps):
+        """Show each camera's frame rate in the status indicator"""
+        if not self.is_detecting:
+            return
+        rates = " | ".join(f"Camera {cid + 1}: {rate:.0f} fps"
+                           for cid, rate in sorted(self.camera_pool.fps.items()))
+        self.status_indicator.setText(f"Active - {rates}")
+        self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
+
+    def on_pool_error(self, camera_id, message):
+        """Report a failed camera; stop once no camera process is left"""
+        self.add_command(f"Camera {camera_id + 1}: {message}", "error")
+        if self.is_detecting and not self.camera_pool.is_running():
+            self.toggle_detection()
+
+    def update_shared_feed(self):
+        """Show the newest frame from the capture process, straight from shared memory"""
+        if not self.view_active:
+            return
+        latest = self.shm_capture.take_frame()
+        if latest is None:
+            return
+        image, detection, stamps = latest
+        self.gesture_visualizer.setDetection(detection)
+        self.gesture_visualizer.setImage(image, stamps)
+
+    def on_shared_gesture(self, gesture):
+        """Add a gesture recognized by the capture process"""
+        action = self.gesture_templates.action_for(gesture)
+        self.add_command(f"{gesture}: {action}" if action else gesture)
+
+    def on_shared_fps(self, fps):
+        """Show the capture process's frame rate in the status indicator"""
+        if self.is_detecting:
+            self.status_indicator.setText(f"Active - {fps:.0f} fps")
+
+    def on_shared_error(self, message):
+        """Report a failed capture process and stop"""
+        self.add_command(message, "error")
+        if self.is_detecting:
+            self.toggle_detection()
+
     def update_camera_feed(self):
         """Update the camera feed with gesture detection visualization"""
-        if self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                # Here you would add actual hand gesture detection
-                # For now, we just update the visualizer
-                pass
+        if not self.capture_worker:
+            return
+            
+        # Wait for the scheduler's next slot instead of piling up work
+        now = time.monotonic()
+        delay = self.frame_scheduler.poll_delay(now)
+        if delay > 0:
+            if not self.poll_timer.isActive():
+                self.poll_timer.start(int(delay * 1000) + 1)
+            return
+            
+        latest = self.capture_worker.take_frame()
+        if latest is None:
+            return
+        frame, timestamp = latest
+        scheduler = self.frame_scheduler
+        scheduler.observe_capture(timestamp, self.capture_worker.ring.published)
+        detect = scheduler.begin_frame(now)
+        
+        result = self.gesture_pipeline.process(frame, timestamp, detect)
+        detection = result.detection
+        stamps = {"capture": timestamp}
+        stamps.update(self.gesture_pipeline.stamps)
+        if self.recording_name is not None:
+            stroke = self.gesture_pipeline.classifier.last_stroke
+            if stroke is not None:
+                self.save_recording(stroke)
+        elif result.gesture is not None:
+            action = self.gesture_templates.action_for(result.gesture)
+            self.add_command(f"{result.gesture}: {action}" if action else result.gesture)
+            stamps["dispatch"] = time.monotonic()
+            if self.gesture_clips and (self.last_gesture_clip is None or
+                                       timestamp - self.last_gesture_clip >= self.GESTURE_CLIP_INTERVAL):
+                self.last_gesture_clip = timestamp
+                self.clip_recorder.trigger(result.gesture, timestamp)
+            
+        # Hidden views only detect; nothing is drawn
+        display_cost = 0.0
+        if self.view_active:
+            display_start = time.perf_counter()
+            self.gesture_visualizer.setDetection(detection)
+            self.gesture_visualizer.setFrame(frame, stamps)
+            display_cost = time.perf_counter() - display_start + self.gesture_visualizer.paint_cost
+        
+        detect_cost = sum(self.gesture_pipeline.timings.values()) if detect else None
+        scheduler.end_frame(display_cost, detect_cost)
+
+    def toggle_recording(self):
+        """Start recording a new gesture template, or cancel the recording"""
+        if self.recording_name is not None:
+            self.stop_recording()
+            self.add_command("Gesture recording cancelled", "error")
+            return
+        if self.frame_source is None and len(self.camera_devices) > 1:
+            self.add_command("Select a single camera to record gestures", "error")
+            return
+            
+        name, ok = QInputDialog.getText(self, "Record Gesture", "Gesture name:")
+        name = name.strip()
+        if not ok or not name:
+            return
+        action, ok = QInputDialog.getText(self, "Record Gesture",
+                                          f"Action to run for \"{name}\" (optional):")
+        if not ok:
+            return
+            
+        self.recording_name = name
+        self.recording_action = action.strip()
+        self.gesture_pipeline.classifier.recording = True
+        self.record_button.setText("Cancel Recording")
+        self.add_command(f"Recording \"{name}\": trace the gesture, then lower your hand")
+        if not self.is_detecting:
+            self.toggle_detection()
+
+    def save_recording(self, stroke):
+        """Store the stroke just traced as the template being recorded"""
+        if np.ptp(stroke, axis=0).max() < self.gesture_pipeline.classifier.min_stroke_extent:
+            self.add_command("Gesture too small, trace it again", "error")
+            return
+        self.gesture_templates.add(self.recording_name, stroke, self.recording_action)
+        try:
+            self.gesture_templates.save()
+            self.add_command(f"Saved gesture \"{self.recording_name}\"")
+        except OSError as e:
+            self.add_command(f"Could not save gesture: {e}", "error")
+        self.stop_recording()
+
+    def stop_recording(self):
+        """Leave recording mode"""
+        self.recording_name = None
+        self.recording_action = ""
+        self.gesture_pipeline.classifier.recording = False
+        self.record_button.setText("Record Gesture")
+
+    def save_clip(self):
+        """Save the last few seconds of camera frames (F9)"""
+        if self.capture_worker is not None:
+            self.clip_recorder.trigger("hotkey")
+
+    def on_clip_saved(self, path):
+        """Note a saved clip next to the status, keeping it out of the command history"""
+        self.clip_label.setText(f"Clip saved: {os.path.basename(path)}")
+
+    def set_target_fps(self, fps):
+        """Change the frame rate the scheduler tries to hold on screen"""
+        self.target_fps = fps
+        if self.view_active:
+            self.frame_scheduler.set_target_fps(fps)
+
+    def set_view_active(self, active):
+        """Render only while on screen; detect in the background if allowed"""
+        super().set_view_active(active)
+        self.gesture_visualizer.setRendering(active)
+        
+        if active:
+            if not self.camera_warmed:
+                self.camera_warmed = True
+                self.warm_camera()
+            self.gesture_pipeline.set_background(False)
+            self.frame_scheduler.set_target_fps(self.target_fps)
+            if self.resume_on_show and not self.is_detecting:
+                self.toggle_detection()
+            self.resume_on_show = False
+        elif self.is_detecting:
+            if self.run_in_background:
+                self.gesture_pipeline.set_background(True)
+                self.frame_scheduler.set_target_fps(self.BACKGROUND_FPS)
+            else:
+                # Background work is not allowed: release the camera until shown again
+                self.toggle_detection()
+                self.resume_on_show = True
+
+    def warm_camera(self):
+        """Open the selected camera ahead of time so Start Camera is instant"""
+        if self.frame_source is not None:
+            return
+        if len(self.camera_devices) == 1 and not self.process_capture:
+            camera_manager.preopen(self.camera_devices[0])
+        else:
+            # Capture processes open these devices themselves and would find them
+            # busy; nothing starts yet, so the GUI does not wait for the close
+            camera_manager.close_devices(self.camera_devices, timeout=0)
+
+    def set_run_in_background(self, enabled):
+        """Apply the "Run in Background" system setting"""
+        self.run_in_background = enabled
+        if not self.view_active:
+            self.set_view_active(False)
+
+    def toggle_latency_overlay(self):
+        """Show or hide the latency debug overlay"""
+        if self.latency_timer.isActive():
+            self.latency_timer.stop()
+            self.gesture_visualizer.setLatencyOverlay(False)
+        else:
+            self.latency_timer.start(250)
+            self.update_latency_overlay()
+
+    def update_latency_overlay(self):
+        """Refresh the overlay text from the latency histograms"""
+        lines = []
+        for name, (count, p50, p99) in self.latency_tracker.summary().items():
+            lines.append(f"{name}: p50 {p50:.1f} / p99 {p99:.1f} ms")
+        self.gesture_visualizer.setLatencyOverlay(True, lines)
+
+    def set_camera_source(self, index):
+        """Select the camera(s) used the next time detection starts"""
+        if 0 <= index < len(self.CAMERA_SOURCES):
+            self.camera_devices = self.CAMERA_SOURCES[index]
+            if self.camera_warmed:
+                self.warm_camera()
+
+    def set_frame_source(self, source):
+        """Feed the view from a FrameSource instead of a camera; None restores the camera"""
+        self.frame_source = source
+
+    def set_process_capture(self, enabled):
+        """Apply the "Capture in Separate Process" setting from the next start"""
+        self.process_capture = enabled
+        if self.camera_warmed:
+            self.warm_camera()
+
+    def set_gesture_clips(self, enabled):
+        """Apply the "Save Clips on Gestures" setting"""
+        self.gesture_clips = enabled
+        
+    def set_show_skeleton(self, show):
+        """Apply the "Show Hand Skeleton" setting"""
+        self.gesture_visualizer.setShowSkeleton(show)
+
+    def set_detection_sensitivity(self, sensitivity):
+        """Apply the Detection Sensitivity setting to the analysis resolution"""
+        self.gesture_pipeline.set_sensitivity(sensitivity)
 
     def closeEvent(self, event):
         """Handle close event to release the camera"""
-        if self.cap:
-            self.cap.release()
+        self.stop_capture()
+        self.clip_recorder.close()
         super().closeEvent(event)
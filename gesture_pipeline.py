@@ -0,0 +1,173 @@
+import time
+from collections import namedtuple
+
+import cv2
+
+from gesture_classifier import GestureClassifier
+from hand_detector import HandDetector, scale_detection
+from hand_tracker import HandTracker
+from motion_gate import MotionGate
+
+# Output of one pipeline step: the hand in frame coordinates (or None) and
+# the name of a gesture completed on this frame (or None)
+PipelineResult = namedtuple("PipelineResult", ["detection", "gesture"])
+
+
+def sensitivity_to_pyramid_level(sensitivity):
+    """Map the 0-100 Detection Sensitivity setting to an analysis pyramid level"""
+    if sensitivity >= 80:
+        return 0
+    if sensitivity >= 40:
+        return 1
+    return 2
+
+
+class GesturePipeline:
+    """Per-frame gesture processing, run on a downscaled analysis image
+
+    A motion gate runs first; on static scenes detection is skipped and the
+    tracker's estimate is carried forward instead. Between full detections
+    a Kalman tracker carries the hand, and its smoothed estimate is what the
+    classifier and the display see. Each pyramid level halves the analysis
+    resolution, so level 1 processes a quarter of the pixels and level 2 a
+    sixteenth. Detections are mapped back to the resolution of the incoming
+    frame, and the gesture classifier runs on every frame.
+    """
+
+    MAX_PYRAMID_LEVEL = 3
+    # Never analyse images narrower than this, whatever the level
+    MIN_ANALYSIS_WIDTH = 160
+
+    def __init__(self, pyramid_level=1):
+        self.motion_gate = MotionGate()
+        self.detector = HandDetector()
+        self.tracker = HandTracker()
+        self.classifier = GestureClassifier()
+        self.pyramid_level = pyramid_level
+        # Background mode analyses one pyramid level coarser to save power
+        self.background = False
+        self.analysis = None
+        self.gray = None
+        self.last_detection = None
+        self.factor = 1
+        # Duration in seconds of each stage on the last processed frame
+        self.timings = {"gate": 0.0, "downscale": 0.0, "track": 0.0, "detect": 0.0,
+                        "classify": 0.0}
+        # Monotonic time at which the last frame finished detection and classification
+        self.stamps = {"detect": 0.0, "classify": 0.0}
+
+    def set_pyramid_level(self, level):
+        """Change the analysis resolution; tracking restarts at the new scale"""
+        level = max(0, min(self.MAX_PYRAMID_LEVEL, int(level)))
+        if level != self.pyramid_level:
+            self.pyramid_level = level
+            self.analysis = None
+            self.reset_tracking()
+
+    def set_background(self, background):
+        """Switch the reduced-resolution background mode on or off"""
+        if background != self.background:
+            self.background = background
+            self.analysis = None
+            self.reset_tracking()
+
+    def set_sensitivity(self, sensitivity):
+        """Pick the pyramid level from the Detection Sensitivity setting"""
+        self.set_pyramid_level(sensitivity_to_pyramid_level(sensitivity))
+
+    def reset_tracking(self):
+        """Restart hand tracking, e.g. after the analysis scale changed"""
+        self.detector.reset()
+        self.tracker.reset()
+
+    def reset(self):
+        """Forget all per-stream state"""
+        self.motion_gate.reset()
+        self.reset_tracking()
+        self.classifier.reset()
+        self.last_detection = None
+
+    def analysis_scale(self, width):
+        """Return the downscale factor used for frames of the given width"""
+        level = self.pyramid_level + (1 if self.background else 0)
+        factor = 2 ** min(level, self.MAX_PYRAMID_LEVEL)
+        while factor > 1 and width // factor < self.MIN_ANALYSIS_WIDTH:
+            factor //= 2
+        return factor
+
+    def downscale(self, frame):
+        """Return the analysis image for frame and its downscale factor"""
+        height, width = frame.shape[:2]
+        factor = self.analysis_scale(width)
+        if factor == 1:
+            return frame, 1
+
+        size = (width // factor, height // factor)
+        if self.analysis is None or self.analysis.shape[1::-1] != size:
+            self.analysis = None
+            self.reset_tracking()
+        self.analysis = cv2.resize(frame, size, dst=self.analysis, interpolation=cv2.INTER_AREA)
+        return self.analysis, factor
+
+    def process(self, frame, timestamp=None, detect=True):
+        """Run the pipeline on a BGR frame captured at timestamp (monotonic seconds)
+
+        With detect False the detection stages are skipped as if the scene were
+        static, and the classifier sees the tracked hand moved on to timestamp,
+        so a swipe keeps advancing on frames that were not analysed.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        timings = self.timings
+        start = time.perf_counter()
+        moving = detect and self.motion_gate.check(frame)
+        gated = time.perf_counter()
+        timings["gate"] = gated - start
+        timings["downscale"] = timings["track"] = timings["detect"] = 0.0
+
+        if moving:
+            analysis, self.factor = self.downscale(frame)
+            self.gray = cv2.cvtColor(analysis, cv2.COLOR_BGR2GRAY, dst=self.gray)
+            downscaled = time.perf_counter()
+
+            tracker = self.tracker
+            tracked = not tracker.needs_detection() and tracker.track(self.gray, timestamp)
+            checked = time.perf_counter()
+            if not tracked:
+                # Start the detector's search where the tracker expects the hand
+                predicted = tracker.predicted_box()
+                if predicted is not None:
+                    self.detector.last_box = predicted
+                detection = self.detector.detect(analysis)
+                if detection is None:
+                    tracker.miss()
+                else:
+                    tracker.correct(detection, self.gray, timestamp)
+
+            estimate = tracker.estimate()
+            detected = time.perf_counter()
+            timings["downscale"] = downscaled - gated
+            timings["track"] = checked - downscaled
+            timings["detect"] = detected - checked
+        else:
+            # Repeating the last position would read as the hand stopping
+            estimate = self.tracker.estimate(timestamp)
+            detected = gated
+        self.last_detection = scale_detection(estimate, self.factor) if estimate else None
+        self.stamps["detect"] = time.monotonic()
+
+        # The classifier sees every frame so held poses are still recognised
+        height, width = frame.shape[:2]
+        gesture = self.classifier.update(timestamp, self.last_detection, width, height)
+        timings["classify"] = time.perf_counter() - detected
+        self.stamps["classify"] = time.monotonic()
+        return PipelineResult(self.last_detection, gesture)
+
+    def skip_ratio(self):
+        """Fraction of frames the motion gate kept away from detection"""
+        return self.motion_gate.skip_ratio()
+
+    def track_ratio(self):
+        """Fraction of analysed frames handled by the tracker alone"""
+        return self.tracker.track_ratio()
@@ -0,0 +1,142 @@
+import os
+
+import numpy as np
+
+from dtw import dtw_costs, envelopes, lb_keogh
+
+# Where recorded gestures are stored
+TEMPLATES_PATH = os.path.join(os.path.expanduser("~"), ".gaminator", "gesture_templates.npz")
+
+# Points per normalized trajectory
+TRAJECTORY_LENGTH = 32
+
+
+def normalize_trajectory(points, length=TRAJECTORY_LENGTH):
+    """Resample a (n, 2) trajectory to length points, centred and scaled to unit size
+
+    Resampling is by arc length, so the result depends on the path's shape
+    and not on how fast it was drawn.
+    """
+    points = np.asarray(points, np.float32)
+    steps = np.hypot(*np.diff(points, axis=0).T)
+    distance = np.concatenate([[0.0], np.cumsum(steps)])
+    if distance[-1] <= 0:
+        return np.zeros((length, 2), np.float32)
+    targets = np.linspace(0.0, distance[-1], length)
+    resampled = np.stack([np.interp(targets, distance, points[:, 0]),
+                          np.interp(targets, distance, points[:, 1])], axis=1)
+    resampled -= resampled.mean(axis=0)
+    # One scale for both axes keeps the aspect ratio of the shape
+    resampled /= max(np.ptp(resampled, axis=0).max(), 1e-6)
+    return resampled.astype(np.float32)
+
+
+class GestureTemplateLibrary:
+    """Named gesture trajectories, matched with banded DTW
+
+    Templates are normalized trajectories stored together in one compressed
+    .npz file, which is only read the first time the library is used. To
+    match a trajectory, LB_Keogh lower bounds against every template are
+    computed at once; templates are then checked in order of their bound, in
+    small batches, and the search stops as soon as no remaining bound can
+    beat the best match found.
+    """
+
+    BATCH = 8
+
+    def __init__(self, path=TEMPLATES_PATH, radius=4, max_distance=0.12):
+        self.path = path
+        self.radius = radius
+        # Largest accepted RMS distance between normalized trajectories
+        self.max_distance = max_distance
+        self.names = None
+        self.actions = None
+        self.templates = None
+        self.dtw_runs = 0
+
+    def load(self):
+        """Read the template file once; a missing or corrupt file means no templates"""
+        if self.templates is not None:
+            return
+        try:
+            with np.load(self.path) as data:
+                self.names = [str(name) for name in data["names"]]
+                self.actions = [str(action) for action in data["actions"]]
+                self.templates = data["templates"].astype(np.float32)
+        except (OSError, KeyError, ValueError):
+            self.names = []
+            self.actions = []
+            self.templates = np.zeros((0, TRAJECTORY_LENGTH, 2), np.float32)
+        self.update_envelopes()
+
+    def save(self):
+        """Write all templates to the template file"""
+        self.load()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        np.savez_compressed(self.path, names=np.array(self.names), actions=np.array(self.actions),
+                            templates=self.templates.astype(np.float16))
+
+    def update_envelopes(self):
+        """Recompute the LB_Keogh envelopes after the templates changed"""
+        self.lower, self.upper = envelopes(self.templates, self.radius)
+
+    def __len__(self):
+        self.load()
+        return len(self.names)
+
+    def add(self, name, points, action=""):
+        """Store a trajectory under name, replacing any template of that name"""
+        self.load()
+        self.remove(name)
+        self.names.append(name)
+        self.actions.append(action)
+        self.templates = np.concatenate([self.templates, normalize_trajectory(points)[None]])
+        self.update_envelopes()
+
+    def remove(self, name):
+        """Delete the template called name, if there is one"""
+        self.load()
+        if name not in self.names:
+            return
+        index = self.names.index(name)
+        del self.names[index]
+        del self.actions[index]
+        self.templates = np.delete(self.templates, index, axis=0)
+        self.update_envelopes()
+
+    def action_for(self, name):
+        """Return the action bound to a template, or an empty string"""
+        self.load()
+        if name in self.names:
+            return self.actions[self.names.index(name)]
+        return ""
+
+    def match(self, points):
+        """Return (name, distance) of the closest template, or None if none is close"""
+        self.load()
+        if not self.names:
+            return None
+        query = normalize_trajectory(points)
+        length = len(query)
+        # Work in summed squared cost, the unit DTW and LB_Keogh share
+        limit = self.max_distance ** 2 * length
+        bounds = lb_keogh(query, self.lower, self.upper)
+        order = np.argsort(bounds)
+        order = order[bounds[order] < limit]
+
+        best_index = None
+        best_cost = limit
+        for start in range(0, len(order), self.BATCH):
+            batch = order[start:start + self.BATCH]
+            batch = batch[bounds[batch] < best_cost]
+            if not len(batch):
+                break
+            costs = dtw_costs(query, self.templates[batch], self.radius)
+            self.dtw_runs += len(batch)
+            winner = int(np.argmin(costs))
+            if costs[winner] < best_cost:
+                best_index, best_cost = int(batch[winner]), float(costs[winner])
+
+        if best_index is None:
+            return None
+        return self.names[best_index], float(np.sqrt(best_cost / length))
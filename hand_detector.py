@@ -0,0 +1,150 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# A detected hand in frame coordinates. box is (x, y, w, h), contour and hull
+# are int32 point arrays, fingertips is an (n, 2) array of fingertip points.
+HandDetection = namedtuple("HandDetection", ["box", "centroid", "contour", "hull", "fingertips", "area"])
+
+
+class HandDetector:
+    """Skin-segmentation hand detector with ROI tracking
+
+    The first search covers the whole frame. Once a hand has been found, later
+    frames only search a region around the last hand box; the region grows on
+    every miss and the detector falls back to a full-frame search once the
+    hand has been missed for too many frames.
+    """
+
+    # Skin range in YCrCb, fairly robust to lighting changes
+    SKIN_LOWER = np.array([0, 133, 77], np.uint8)
+    SKIN_UPPER = np.array([255, 173, 127], np.uint8)
+
+    def __init__(self, min_area_ratio=0.01, roi_margin=0.5, max_misses=5):
+        self.min_area_ratio = min_area_ratio
+        self.roi_margin = roi_margin
+        self.max_misses = max_misses
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        self.last_box = None
+        self.misses = 0
+        self.full_searches = 0
+        self.roi_searches = 0
+
+    def reset(self):
+        """Forget the tracked hand so the next frame is a full-frame search"""
+        self.last_box = None
+        self.misses = 0
+
+    def detect(self, frame):
+        """Return a HandDetection for the most prominent hand in frame, or None"""
+        height, width = frame.shape[:2]
+        min_area = self.min_area_ratio * width * height
+
+        if self.last_box is not None:
+            # Track: only look around where the hand was last seen
+            x0, y0, x1, y1 = self.search_region(self.last_box, width, height)
+            self.roi_searches += 1
+            detection = self.search(frame, x0, y0, x1, y1, min_area)
+            if detection is not None:
+                self.last_box = detection.box
+                self.misses = 0
+                return detection
+
+            self.misses += 1
+            if self.misses <= self.max_misses:
+                return None
+            self.reset()
+
+        # Tracking lost (or never started): search the whole frame
+        self.full_searches += 1
+        detection = self.search(frame, 0, 0, width, height, min_area)
+        if detection is not None:
+            self.last_box = detection.box
+        return detection
+
+    def search_region(self, box, width, height):
+        """Return the ROI around box, expanded further after every miss"""
+        x, y, w, h = box
+        margin = int(max(w, h) * self.roi_margin * (1 + self.misses))
+        return (max(0, x - margin), max(0, y - margin),
+                min(width, x + w + margin), min(height, y + h + margin))
+
+    def segment(self, image):
+        """Return a binary skin mask for a BGR image"""
+        ycrcb = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
+        mask = cv2.inRange(ycrcb, self.SKIN_LOWER, self.SKIN_UPPER)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+        return cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel)
+
+    def search(self, frame, x0, y0, x1, y1, min_area):
+        """Look for a hand inside frame[y0:y1, x0:x1]"""
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        mask = self.segment(frame[y0:y1, x0:x1])
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            return None
+
+        areas = np.array([cv2.contourArea(c) for c in contours])
+        best = int(np.argmax(areas))
+        if areas[best] < min_area:
+            return None
+
+        contour = contours[best] + np.array([x0, y0], np.int32)
+        return analyze_contour(contour, float(areas[best]))
+
+
+def analyze_contour(contour, area):
+    """Build a HandDetection from a hand contour using its convexity defects"""
+    x, y, w, h = cv2.boundingRect(contour)
+    moments = cv2.moments(contour)
+    if moments["m00"]:
+        centroid = (moments["m10"] / moments["m00"], moments["m01"] / moments["m00"])
+    else:
+        centroid = (x + w / 2.0, y + h / 2.0)
+
+    hull = cv2.convexHull(contour)
+    fingertips = np.empty((0, 2), np.int32)
+    try:
+        hull_indices = cv2.convexHull(contour, returnPoints=False)
+        defects = cv2.convexityDefects(contour, hull_indices) if len(hull_indices) > 3 else None
+    except cv2.error:
+        defects = None
+
+    if defects is not None:
+        points = contour.reshape(-1, 2).astype(np.float32)
+        defects = defects.reshape(-1, 4)
+        start = points[defects[:, 0]]
+        end = points[defects[:, 1]]
+        far = points[defects[:, 2]]
+        depth = defects[:, 3] / 256.0
+
+        # Valleys between fingers are deep with a sharp (< 90 degree) angle
+        a = np.linalg.norm(end - start, axis=1)
+        b = np.linalg.norm(far - start, axis=1)
+        c = np.linalg.norm(end - far, axis=1)
+        cos_angle = (b ** 2 + c ** 2 - a ** 2) / np.maximum(2 * b * c, 1e-6)
+        valleys = (cos_angle > 0) & (depth > 0.1 * h)
+
+        if np.any(valleys):
+            # Defects run along the contour, so neighbouring valleys share a
+            # fingertip: n valleys separate n + 1 fingers
+            tips = np.concatenate([start[valleys], end[valleys][-1:]])
+            fingertips = tips.astype(np.int32)
+
+    return HandDetection((x, y, w, h), centroid, contour, hull, fingertips, area)
+
+
+def scale_detection(detection, factor):
+    """Map a detection found on a downscaled image back to full resolution"""
+    if factor == 1:
+        return detection
+    x, y, w, h = detection.box
+    box = (int(x * factor), int(y * factor), int(w * factor), int(h * factor))
+    centroid = (detection.centroid[0] * factor, detection.centroid[1] * factor)
+    return HandDetection(box, centroid,
+                         (detection.contour * factor).astype(np.int32),
+                         (detection.hull * factor).astype(np.int32),
+                         (detection.fingertips * factor).astype(np.int32),
+                         detection.area * factor * factor)
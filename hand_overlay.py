@@ -0,0 +1,89 @@
+import numpy as np
+from PyQt5.QtCore import Qt, QPointF, QRectF
+from PyQt5.QtGui import QColor, QPainterPath, QPen, QTransform
+
+
+class HandOverlay:
+    """Vector overlay of a detected hand: bounding box, hull and skeleton
+
+    The overlay is drawn with QPainter on top of the frame, so frames are
+    never modified and lines stay sharp at any widget size. The hull and
+    skeleton paths are built relative to the hull's first point and only
+    rebuilt when the hand's shape changes; a hand that merely moves, as it
+    does between tracked frames, reuses the cached paths at a new offset.
+    """
+
+    COLOR = QColor(139, 92, 246)
+    FINGERTIP_RADIUS = 6
+
+    def __init__(self):
+        self.visible = True
+        self.detection = None
+        self.anchor = QPointF()
+        self.shape_key = None
+        self.hull_path = QPainterPath()
+        self.skeleton_path = QPainterPath()
+        self.path_builds = 0
+
+        self.box_pen = QPen(self.COLOR, 2)
+        self.hull_pen = QPen(self.COLOR, 1)
+        self.skeleton_pen = QPen(self.COLOR, 2)
+        # Pen widths are in screen pixels whatever the frame scale
+        for pen in (self.box_pen, self.hull_pen, self.skeleton_pen):
+            pen.setCosmetic(True)
+
+    def set_detection(self, detection):
+        """Show a HandDetection in frame coordinates, or nothing for None"""
+        self.detection = detection
+        if detection is None or not len(detection.hull):
+            return
+        anchor = detection.hull.reshape(-1, 2)[0]
+        self.anchor = QPointF(float(anchor[0]), float(anchor[1]))
+
+        hull = detection.hull.reshape(-1, 2) - anchor
+        tips = np.asarray(detection.fingertips, np.int32).reshape(-1, 2) - anchor
+        centre = np.rint(np.asarray(detection.centroid) - anchor).astype(np.int32)
+        key = (hull.tobytes(), tips.tobytes(), centre.tobytes())
+        if key != self.shape_key:
+            self.shape_key = key
+            self.build_paths(hull, tips, centre)
+
+    def build_paths(self, hull, tips, centre):
+        """Rebuild the cached hull and skeleton paths (anchor-relative)"""
+        self.hull_path = QPainterPath()
+        self.hull_path.moveTo(float(hull[0][0]), float(hull[0][1]))
+        for x, y in hull[1:]:
+            self.hull_path.lineTo(float(x), float(y))
+        self.hull_path.closeSubpath()
+
+        self.skeleton_path = QPainterPath()
+        palm = QPointF(float(centre[0]), float(centre[1]))
+        for x, y in tips:
+            tip = QPointF(float(x), float(y))
+            self.skeleton_path.moveTo(palm)
+            self.skeleton_path.lineTo(tip)
+            self.skeleton_path.addEllipse(tip, self.FINGERTIP_RADIUS, self.FINGERTIP_RADIUS)
+        self.skeleton_path.addEllipse(palm, self.FINGERTIP_RADIUS, self.FINGERTIP_RADIUS)
+        self.path_builds += 1
+
+    def paint(self, painter, target, frame_width, frame_height):
+        """Draw the overlay for a frame of the given size shown in the target rect"""
+        if not self.visible or self.detection is None or frame_width <= 0:
+            return
+        transform = QTransform()
+        transform.translate(target.x(), target.y())
+        transform.scale(target.width() / frame_width, target.height() / frame_height)
+
+        painter.save()
+        painter.setTransform(transform, True)
+        painter.setBrush(Qt.NoBrush)
+        painter.setPen(self.box_pen)
+        x, y, w, h = self.detection.box
+        painter.drawRect(QRectF(x, y, w, h))
+
+        painter.translate(self.anchor)
+        painter.setPen(self.hull_pen)
+        painter.drawPath(self.hull_path)
+        painter.setPen(self.skeleton_pen)
+        painter.drawPath(self.skeleton_path)
+        painter.restore()
@@ -0,0 +1,183 @@
+import cv2
+import numpy as np
+
+from hand_detector import HandDetection
+
+
+class HandTracker:
+    """Constant-velocity Kalman tracker that carries a hand between detections
+
+    The filter state is the hand box centre and size plus their velocities.
+    After a full detection the hand's gray patch is kept as a template; on the
+    frames in between, the box is predicted by the filter and confirmed by
+    matching the template around the prediction. Every confident match
+    stretches the interval until the next full detection, and a poor match
+    forces one straight away. Output boxes are the filter's smoothed
+    estimate, with the last detected contour moved along with them.
+    """
+    # Templates are matched at a scale where their longer side is about this many pixels
+    MATCH_SIZE = 24
+
+    def __init__(self, max_interval=6, min_confidence=0.6, extend_confidence=0.8,
+                 search_margin=0.5):
+        self.max_interval = max_interval
+        self.min_confidence = min_confidence
+        self.extend_confidence = extend_confidence
+        self.search_margin = search_margin
+
+        # State (cx, cy, w, h, vcx, vcy, vw, vh); measurement (cx, cy, w, h)
+        self.kalman = cv2.KalmanFilter(8, 4)
+        self.kalman.measurementMatrix = np.eye(4, 8, dtype=np.float32)
+        self.kalman.processNoiseCov = np.diag(
+            np.array([4, 4, 4, 4, 25, 25, 25, 25], np.float32))
+        # Template matches only locate the centre, so they are trusted less
+        self.detection_noise = np.eye(4, dtype=np.float32) * 4
+        self.match_noise = np.diag(np.array([16, 16, 1e4, 1e4], np.float32))
+
+        self.tracked_frames = 0
+        self.detected_frames = 0
+        self.reset()
+
+    def reset(self):
+        """Forget the tracked hand so the next frame runs a full detection"""
+        self.active = False
+        self.template = None
+        self.detection = None
+        self.last_time = None
+        self.interval = 1
+        self.since_detection = 0
+        self.confidence = 0.0
+
+    def needs_detection(self):
+        """Whether the next frame should run the full hand detector"""
+        return not self.active or self.since_detection >= self.interval
+
+    def predicted_box(self):
+        """Return the predicted (x, y, w, h) box, or None when not tracking"""
+        if not self.active:
+            return None
+        cx, cy, w, h = self.kalman.statePre[:4, 0]
+        return (int(cx - w / 2), int(cy - h / 2), int(w), int(h))
+
+    def predict(self, timestamp):
+        """Advance the filter to timestamp"""
+        dt = min(max(timestamp - self.last_time, 1e-3), 0.5)
+        self.last_time = timestamp
+        transition = np.eye(8, dtype=np.float32)
+        transition[:4, 4:] = np.eye(4, dtype=np.float32) * dt
+        self.kalman.transitionMatrix = transition
+        self.kalman.predict()
+
+    def correct(self, detection, gray, timestamp):
+        """Feed a full detection and take a new template from gray"""
+        x, y, w, h = detection.box
+        measurement = np.array([[detection.centroid[0]], [detection.centroid[1]],
+                                [w], [h]], np.float32)
+        if self.active:
+            self.predict(timestamp)
+            self.kalman.measurementNoiseCov = self.detection_noise
+            self.kalman.correct(measurement)
+        else:
+            state = np.zeros((8, 1), np.float32)
+            state[:4] = measurement
+            self.kalman.statePost = state
+            self.kalman.statePre = state.copy()
+            self.kalman.errorCovPost = np.eye(8, dtype=np.float32)
+            self.last_time = timestamp
+            self.interval = 1
+            self.active = True
+
+        # Match on a coarse copy: the filter only needs the centre to a few pixels
+        self.match_scale = min(1.0, self.MATCH_SIZE / max(w, h, 1))
+        self.template = cv2.resize(gray[y:y + h, x:x + w], None, fx=self.match_scale,
+                                   fy=self.match_scale, interpolation=cv2.INTER_AREA)
+        # Offset of the centroid inside the box, to align template matches
+        self.template_anchor = (detection.centroid[0] - x, detection.centroid[1] - y)
+        self.detection = detection
+        self.since_detection = 0
+        self.confidence = 1.0
+        self.detected_frames += 1
+
+    def miss(self):
+        """Record that the full detector found no hand"""
+        self.reset()
+
+    def track(self, gray, timestamp):
+        """Predict the hand on a frame without detection; return False if unsure
+
+        On False the caller should run the full detector on this frame.
+        """
+        self.predict(timestamp)
+        th, tw = self.template.shape[:2]
+        if tw < 4 or th < 4:
+            return self.lose_confidence()
+
+        # Search a window around the predicted box
+        scale = self.match_scale
+        cx, cy = self.kalman.statePre[:2, 0]
+        height, width = gray.shape[:2]
+        margin_x = int(tw / scale * (0.5 + self.search_margin))
+        margin_y = int(th / scale * (0.5 + self.search_margin))
+        x0 = max(0, int(cx) - margin_x)
+        y0 = max(0, int(cy) - margin_y)
+        x1 = min(width, int(cx) + margin_x)
+        y1 = min(height, int(cy) + margin_y)
+        # A fast hand can be predicted partly or wholly off the frame
+        if (x1 - x0) * scale < tw or (y1 - y0) * scale < th:
+            return self.lose_confidence()
+        window = cv2.resize(gray[y0:y1, x0:x1], None, fx=scale, fy=scale,
+                            interpolation=cv2.INTER_AREA)
+        if window.shape[1] < tw or window.shape[0] < th:
+            return self.lose_confidence()
+
+        scores = cv2.matchTemplate(window, self.template, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (mx, my) = cv2.minMaxLoc(scores)
+        self.confidence = score
+        if score < self.min_confidence:
+            return self.lose_confidence()
+
+        measurement = np.array([[x0 + mx / scale + self.template_anchor[0]],
+                                [y0 + my / scale + self.template_anchor[1]],
+                                self.kalman.statePre[2], self.kalman.statePre[3]], np.float32)
+        self.kalman.measurementNoiseCov = self.match_noise
+        self.kalman.correct(measurement)
+
+        self.since_detection += 1
+        self.tracked_frames += 1
+        if score >= self.extend_confidence and self.since_detection >= self.interval:
+            # Confident all the way to the next detection: wait longer next time
+            self.interval = min(self.max_interval, self.interval + 1)
+        return True
+
+    def lose_confidence(self):
+        """Fall back to detecting every frame until the track is solid again"""
+        self.interval = 1
+        self.since_detection = self.interval
+        return False
+
+    def estimate(self, timestamp=None):
+        """Return the smoothed hand as a HandDetection, or None when not tracking
+
+        With a timestamp the estimate is carried forward to it at the filter's
+        velocity, for frames that were not analysed; the filter is not changed.
+        """
+        if not self.active:
+            return None
+        state = self.kalman.statePost[:, 0]
+        if timestamp is not None:
+            state = state[:4] + state[4:] * min(max(timestamp - self.last_time, 0.0), 0.5)
+        cx, cy, w, h = (float(v) for v in state[:4])
+        detection = self.detection
+        dx = int(round(cx - detection.centroid[0]))
+        dy = int(round(cy - detection.centroid[1]))
+        offset = np.array([dx, dy], np.int32)
+        _, _, dw, dh = detection.box
+        return HandDetection((int(cx - w / 2), int(cy - h / 2), int(w), int(h)), (cx, cy),
+                             detection.contour + offset, detection.hull + offset,
+                             detection.fingertips + offset,
+                             detection.area * (w * h) / max(dw * dh, 1))
+
+    def track_ratio(self):
+        """Fraction of analysed frames carried by the tracker instead of detection"""
+        total = self.tracked_frames + self.detected_frames
+        return self.tracked_frames / total if total else 0.0
@@ -0,0 +1,148 @@
+import os
+import threading
+
+import numpy as np
+
+from audio_features import MfccExtractor
+from dtw import dtw_costs
+
+# Where enrolled command recordings are stored
+TEMPLATES_PATH = os.path.join(os.path.expanduser("~"), ".gaminator", "voice_templates.npz")
+
+# The commands the voice view offers
+COMMANDS = ["Open Browser", "Volume Up", "Close Window", "Scroll Down", "Next Slide"]
+
+
+class KeywordSpotter:
+    """Offline command recognizer that compares utterances with enrolled examples
+
+    Each utterance is trimmed to its voiced part, turned into normalized
+    MFCCs and resampled to a fixed number of frames. The enrolled examples
+    form one (commands, examples, frames, coefficients) tensor, so an
+    utterance is aligned with every example of every command by a single
+    batched, banded DTW that absorbs differences in speaking rhythm. A
+    command's score is its closest example; confidence is a softmax over
+    the command scores, and utterances that are far from everything are
+    rejected.
+
+    The spotter may be used from several threads: enrolling replaces the
+    template arrays instead of changing them, so a recognition that is
+    already running keeps scoring against a consistent snapshot.
+    """
+    def __init__(self, commands=COMMANDS, path=TEMPLATES_PATH, sample_rate=16000,
+                 examples=5, frames=32, radius=6, max_distance=0.9, min_confidence=0.5, temperature=0.1):
+        self.commands = list(commands)
+        self.path = path
+        self.extractor = MfccExtractor(sample_rate)
+        self.max_examples = examples
+        self.length = frames
+        self.radius = radius
+        self.max_distance = max_distance
+        self.min_confidence = min_confidence
+        self.temperature = temperature
+        self.templates = None
+        self.counts = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        """Read the enrolled examples once; a missing or corrupt file means none"""
+        with self.lock:
+            if self.templates is None:
+                self.read_templates()
+
+    def read_templates(self):
+        """Fill the template arrays from the template file (called with the lock held)"""
+        shape = (len(self.commands), self.max_examples, self.length, self.extractor.n_mfcc)
+        self.templates = np.zeros(shape, np.float32)
+        self.counts = np.zeros(len(self.commands), np.int64)
+        try:
+            with np.load(self.path) as data:
+                stored = [str(command) for command in data["commands"]]
+                templates = data["templates"]
+                counts = data["counts"]
+        except (OSError, KeyError, ValueError):
+            return
+        if templates.shape[1:] != shape[1:]:
+            return
+        for index, command in enumerate(stored):
+            if command in self.commands:
+                target = self.commands.index(command)
+                self.templates[target] = templates[index]
+                self.counts[target] = counts[index]
+
+    def save(self):
+        """Write the enrolled examples to the template file"""
+        templates, counts = self.snapshot()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        np.savez_compressed(self.path, commands=np.array(self.commands),
+                            templates=templates.astype(np.float16), counts=counts)
+
+    def snapshot(self):
+        """Return the current (templates, counts) pair"""
+        self.load()
+        with self.lock:
+            return self.templates, self.counts
+
+    def embed(self, samples, mfcc=None):
+        """Return the fixed-size (frames, coefficients) feature matrix of an utterance
+
+        mfcc may hold the utterance's raw MFCCs when they were already computed
+        while it was streaming in.
+        """
+        if mfcc is None or len(mfcc) < 2:
+            mfcc = self.extractor.features(self.extractor.frames(samples))
+        # Drop the silent lead-in and tail the voice activity detector keeps
+        energy = mfcc[:, 0]
+        voiced = np.flatnonzero(energy > energy.min() + 0.35 * (energy.max() - energy.min()))
+        if len(voiced) >= 2:
+            mfcc = mfcc[voiced[0]:voiced[-1] + 1]
+        mfcc = (mfcc - mfcc.mean(axis=0)) / (mfcc.std(axis=0) + 1e-6)
+
+        # Linear time normalization to a fixed number of frames
+        positions = np.linspace(0, len(mfcc) - 1, self.length)
+        low = np.floor(positions).astype(int)
+        high = np.minimum(low + 1, len(mfcc) - 1)
+        fraction = (positions - low)[:, None]
+        return ((1 - fraction) * mfcc[low] + fraction * mfcc[high]).astype(np.float32)
+
+    def enroll(self, command, samples, mfcc=None):
+        """Add an example recording of a command; the oldest is replaced when full"""
+        features = self.embed(samples, mfcc)
+        self.load()
+        index = self.commands.index(command)
+        with self.lock:
+            templates, counts = self.templates.copy(), self.counts.copy()
+            templates[index, counts[index] % self.max_examples] = features
+            counts[index] += 1
+            self.templates, self.counts = templates, counts
+
+    def enrolled(self):
+        """Return {command: number of stored examples}"""
+        _, counts = self.snapshot()
+        return {command: int(min(count, self.max_examples))
+                for command, count in zip(self.commands, counts)}
+
+    def scores(self, features):
+        """Distance from features to each command's closest example (inf if none)"""
+        templates, counts = self.snapshot()
+        commands, examples, length, coefficients = templates.shape
+        batch = templates.reshape(commands * examples, length, coefficients)
+        # Per frame and coefficient, so the thresholds do not depend on the sizes
+        distances = dtw_costs(features, batch, self.radius).reshape(commands, examples)
+        distances /= length * coefficients
+        filled = np.arange(self.max_examples)[None, :] < np.minimum(counts, self.max_examples)[:, None]
+        distances[~filled] = np.inf
+        return distances.min(axis=1)
+
+    def recognize(self, samples, mfcc=None):
+        """Return (command or None, confidence, distance) for an utterance"""
+        scores = self.scores(self.embed(samples, mfcc))
+        best = int(np.argmin(scores))
+        distance = float(scores[best])
+        if not np.isfinite(distance):
+            return None, 0.0, distance
+        weights = np.exp(-(scores - distance) / self.temperature)
+        confidence = float(1.0 / weights.sum())
+        if distance > self.max_distance or confidence < self.min_confidence:
+            return None, confidence, distance
+        return self.commands[best], confidence, distance
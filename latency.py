@@ -0,0 +1,109 @@
+import math
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """Fixed-size histogram of latencies with log-spaced buckets
+
+    Memory is bounded by the number of buckets no matter how many samples are
+    recorded. Percentiles are accurate to the bucket width (about 10% with the
+    defaults).
+    """
+    def __init__(self, min_seconds=1e-4, max_seconds=10.0, buckets=120):
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.log_min = math.log(min_seconds)
+        self.log_step = (math.log(max_seconds) - self.log_min) / buckets
+        self.counts = np.zeros(buckets + 2, np.int64)
+        # Upper edge of every bucket; the first holds underflow, the last overflow
+        self.edges = np.concatenate([
+            [min_seconds],
+            np.exp(self.log_min + self.log_step * np.arange(1, buckets + 1)),
+            [np.inf],
+        ])
+        self.reset()
+
+    def reset(self):
+        """Drop all samples"""
+        self.counts[:] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Add one latency sample"""
+        if seconds < self.min_seconds:
+            index = 0
+        elif seconds >= self.max_seconds:
+            index = len(self.counts) - 1
+        else:
+            index = 1 + int((math.log(seconds) - self.log_min) / self.log_step)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def mean(self):
+        """Average latency in seconds"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        """Latency in seconds below which p percent of samples fall"""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100.0)
+        index = int(np.searchsorted(np.cumsum(self.counts), max(rank, 1)))
+        return min(float(self.edges[index]), self.max)
+
+
+class LatencyTracker:
+    """Per-stage and end-to-end latency histograms for the gesture pipeline
+
+    Each frame carries a dict of monotonic timestamps, one per stage it
+    reached. Recording a frame adds the time between consecutive stages to
+    that hop's histogram, the capture-to-last-stage time to "end_to_end" and,
+    for frames that dispatched a command, capture-to-dispatch to
+    "glass_to_action".
+    """
+
+    STAGES = ("capture", "detect", "classify", "dispatch", "ui")
+
+    def __init__(self):
+        self.histograms = {}
+
+    def histogram(self, name):
+        """Return the histogram called name, creating it on first use"""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        return histogram
+
+    def record(self, stamps):
+        """Record one frame's stage timestamps"""
+        previous = None
+        for stage in self.STAGES:
+            stamp = stamps.get(stage)
+            if stamp is None:
+                continue
+            if previous is not None:
+                self.histogram(f"{previous[0]}->{stage}").record(stamp - previous[1])
+            previous = (stage, stamp)
+
+        capture = stamps.get("capture")
+        if capture is None or previous is None:
+            return
+        self.histogram("end_to_end").record(previous[1] - capture)
+        if "dispatch" in stamps:
+            self.histogram("glass_to_action").record(stamps["dispatch"] - capture)
+
+    def summary(self):
+        """Return {name: (count, p50 ms, p99 ms)} for every histogram"""
+        return {name: (h.count, h.percentile(50) * 1000, h.percentile(99) * 1000)
+                for name, h in self.histograms.items()}
+
+    def reset(self):
+        """Drop all samples"""
+        for histogram in self.histograms.values():
+            histogram.reset()
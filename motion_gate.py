@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Cheap frame-differencing gate in front of the hand detector
+
+    Every frame is shrunk to a tiny grayscale thumbnail and compared with the
+    thumbnail of the last frame that was let through, so slow movement still
+    adds up until it opens the gate. The mean absolute difference is tested
+    against a threshold that tracks the camera's noise level while the scene
+    is static, so the expensive stages only wake up for real motion. Once
+    open, the gate stays open for a few frames so a gesture is not cut off
+    mid-movement.
+    """
+
+    THUMBNAIL_SIZE = (32, 24)
+
+    def __init__(self, sensitivity=3.0, min_threshold=1.0, hold_frames=8, noise_rate=0.05):
+        self.sensitivity = sensitivity
+        self.min_threshold = min_threshold
+        self.hold_frames = hold_frames
+        self.noise_rate = noise_rate
+        width, height = self.THUMBNAIL_SIZE
+        self.small = np.empty((height, width, 3), np.uint8)
+        self.current = np.empty((height, width), np.uint8)
+        self.reference = np.empty((height, width), np.uint8)
+        self.diff = np.empty((height, width), np.uint8)
+        self.reset()
+
+    def reset(self):
+        """Forget the previous frame, noise estimate and counters"""
+        self.primed = False
+        self.noise_mean = 0.0
+        self.noise_dev = 0.0
+        self.hold = 0
+        self.last_score = 0.0
+        self.frames = 0
+        self.skipped = 0
+
+    @property
+    def threshold(self):
+        """Current motion threshold in mean gray levels per pixel"""
+        return max(self.min_threshold, self.noise_mean + self.sensitivity * self.noise_dev)
+
+    def check(self, frame):
+        """Return True if the frame shows enough motion to run detection"""
+        self.frames += 1
+        cv2.resize(frame, self.THUMBNAIL_SIZE, dst=self.small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.current)
+
+        if not self.primed:
+            self.primed = True
+            self.hold = self.hold_frames
+            self.current, self.reference = self.reference, self.current
+            return True
+
+        cv2.absdiff(self.current, self.reference, dst=self.diff)
+        score = float(cv2.mean(self.diff)[0])
+        self.last_score = score
+
+        if score > self.threshold:
+            self.hold = self.hold_frames
+            self.current, self.reference = self.reference, self.current
+            return True
+
+        # Static frame: let the threshold follow the sensor noise
+        self.noise_mean += self.noise_rate * (score - self.noise_mean)
+        self.noise_dev += self.noise_rate * (abs(score - self.noise_mean) - self.noise_dev)
+
+        if self.hold > 0:
+            self.hold -= 1
+            self.current, self.reference = self.reference, self.current
+            return True
+
+        self.skipped += 1
+        return False
+
+    def skip_ratio(self):
+        """Fraction of frames on which detection was skipped"""
+        if not self.frames:
+            return 0.0
+        return self.skipped / self.frames
@@ -0,0 +1,134 @@
+import multiprocessing
+import queue
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from frame_sources import make_source, read_frames
+from gesture_pipeline import GesturePipeline
+from gesture_templates import GestureTemplateLibrary
+
+
+def camera_worker(camera_id, device, pyramid_level, events, stop_event):
+    """Capture and detect on one camera until stop_event is set (runs in a child process)"""
+    source = make_source(device)
+    if not source.open():
+        events.put((camera_id, "error", "Could not open camera"))
+        return
+
+    pipeline = GesturePipeline(pyramid_level)
+    pipeline.classifier.templates = GestureTemplateLibrary()
+
+    def report(kind, value):
+        events.put((camera_id, kind, value))
+
+    try:
+        for frame, now in read_frames(source, stop_event, report):
+            result = pipeline.process(frame, now)
+            if result.gesture is not None:
+                events.put((camera_id, "gesture", result.gesture))
+    except Exception as exc:
+        # Without this the pool would only see the camera fall silent
+        events.put((camera_id, "error", str(exc) or type(exc).__name__))
+    finally:
+        source.release()
+
+
+class MultiCameraPool(QObject):
+    """Runs one capture-and-detect process per camera and merges their events
+
+    Each camera gets its own process so OpenCV and NumPy work is not
+    serialized by the GUI process's GIL. Workers only send small event tuples
+    back; the pool drains them on a Qt timer and re-emits them as signals.
+    """
+
+    gesture_detected = pyqtSignal(int, str)
+    fps_updated = pyqtSignal(int, float)
+    camera_error = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Spawn keeps the children free of the GUI process's Qt state
+        self.context = multiprocessing.get_context("spawn")
+        self.processes = []
+        self.events = None
+        self.stop_event = None
+        self.fps = {}
+        self.failed = set()
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll_events)
+
+    def start(self, devices, pyramid_level=1):
+        """Start one worker process per camera device"""
+        self.stop()
+        self.events = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.fps = {}
+        self.failed = set()
+        for camera_id, device in enumerate(devices):
+            process = self.context.Process(
+                target=camera_worker,
+                args=(camera_id, device, pyramid_level, self.events, self.stop_event),
+                daemon=True)
+            process.start()
+            self.processes.append(process)
+        self.poll_timer.start(20)
+
+    def is_running(self):
+        """Return True while any camera is still working"""
+        return any(process.is_alive() for camera_id, process in enumerate(self.processes)
+                   if camera_id not in self.failed)
+
+    def poll_events(self):
+        """Forward queued worker events as Qt signals"""
+        while self.events is not None:
+            try:
+                camera_id, kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "gesture":
+                self.gesture_detected.emit(camera_id, value)
+            elif kind == "fps":
+                self.fps[camera_id] = value
+                self.fps_updated.emit(camera_id, value)
+            elif kind == "error":
+                self.fail(camera_id, value)
+
+        # A worker that died without a word (e.g. killed) still has to be reported
+        for camera_id, process in enumerate(self.processes):
+            # A handler may have stopped the pool in the meantime
+            if self.stop_event is None or self.stop_event.is_set():
+                break
+            if not process.is_alive():
+                self.fail(camera_id, "Capture process stopped")
+
+    def fail(self, camera_id, message):
+        """Mark a camera as failed and report it once"""
+        if camera_id in self.failed:
+            return
+        self.failed.add(camera_id)
+        self.fps.pop(camera_id, None)
+        self.camera_error.emit(camera_id, message)
+
+    def stop(self, timeout=1.0):
+        """Stop all worker processes"""
+        self.poll_timer.stop()
+        if self.stop_event is not None:
+            self.stop_event.set()
+        # Drain pending events so no worker blocks flushing its queue on exit
+        deadline = time.monotonic() + timeout
+        while self.events is not None and time.monotonic() < deadline:
+            try:
+                self.events.get(timeout=0.05)
+            except queue.Empty:
+                if not self.is_running():
+                    break
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+        if self.events is not None:
+            self.events.close()
+            self.events = None
+        self.stop_event = None
@@ -0,0 +1,158 @@
+import queue
+import threading
+import time
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class RecognitionWorker(QObject):
+    """Runs keyword spotting for the voice view on a small pool of threads
+
+    Speech segments are queued on a bounded queue and picked up by worker
+    threads, so the GUI thread never waits for recognition. When the queue
+    is full the oldest segment is dropped, since a stale command is worse
+    than a missed one. Results travel back through Qt signals. Every job
+    carries the generation it was submitted in; cancel() starts a new
+    generation and empties the queue, and results of an older generation
+    are discarded, including ones that were already on their way to the
+    GUI thread.
+    """
+
+    # Emitted with (command or None, confidence, latency in ms from submit to result);
+    # a segment that could not be processed comes back as not recognized
+    recognized = pyqtSignal(object, float, float)
+    # Emitted with (command, stored examples) after an example was saved, or (command, -1) on error
+    enrolled = pyqtSignal(str, int)
+    # Emitted with the number of segments dropped because the queue was full
+    dropped = pyqtSignal(int)
+    # Internal: results from the worker threads, filtered on the GUI thread
+    job_done = pyqtSignal(int, str, object)
+
+    def __init__(self, spotter, workers=2, max_queue=4, parent=None):
+        super().__init__(parent)
+        self.spotter = spotter
+        self.workers = workers
+        self.jobs = queue.Queue(max_queue)
+        self.threads = []
+        self.generation = 0
+        self.dropped_count = 0
+        # Seconds spent on jobs, for the utilization figure
+        self.busy = 0.0
+        self.busy_since = time.perf_counter()
+        self.active = 0
+        self.lock = threading.Lock()
+        self.job_done.connect(self.on_job_done)
+
+    def start(self):
+        """Start the worker threads if they are not running yet"""
+        if self.threads:
+            return
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self.work_loop, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, samples, features=None):
+        """Queue a speech segment for recognition"""
+        self.put(("recognize", self.generation, time.perf_counter(), samples, features, None))
+
+    def enroll(self, command, samples, features=None):
+        """Queue a speech segment to be stored as an example of command"""
+        self.put(("enroll", self.generation, time.perf_counter(), samples, features, command))
+
+    def put(self, job):
+        self.start()
+        while True:
+            try:
+                self.jobs.put_nowait(job)
+                return
+            except queue.Full:
+                try:
+                    self.jobs.get_nowait()
+                except queue.Empty:
+                    continue
+                self.dropped_count += 1
+                self.dropped.emit(self.dropped_count)
+
+    def cancel(self):
+        """Drop queued segments and ignore the results of those in flight"""
+        self.generation += 1
+        while True:
+            try:
+                self.jobs.get_nowait()
+            except queue.Empty:
+                return
+
+    def work_loop(self):
+        """Worker thread: run jobs until a None job arrives"""
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            kind, generation, submitted, samples, features, command = job
+            if generation != self.generation:
+                continue
+            start = time.perf_counter()
+            with self.lock:
+                self.active += 1
+            try:
+                if kind == "enroll":
+                    result = self.run_enroll(command, samples, features)
+                else:
+                    recognized, confidence, _ = self.spotter.recognize(samples, features)
+                    latency = (time.perf_counter() - submitted) * 1000
+                    result = (recognized, confidence, latency)
+            except Exception:
+                # A bad segment must not take the worker down with it
+                if kind == "enroll":
+                    result = (command, -1)
+                else:
+                    result = (None, 0.0, (time.perf_counter() - submitted) * 1000)
+            finally:
+                with self.lock:
+                    self.active -= 1
+                    self.busy += time.perf_counter() - start
+            self.job_done.emit(generation, kind, result)
+
+    def run_enroll(self, command, samples, features):
+        """Store an example and save the templates; return (command, examples or -1)"""
+        self.spotter.enroll(command, samples, features)
+        try:
+            self.spotter.save()
+        except OSError:
+            return command, -1
+        return command, self.spotter.enrolled()[command]
+
+    def on_job_done(self, generation, kind, result):
+        """Pass on results that were not cancelled while they were being delivered"""
+        if generation != self.generation:
+            return
+        if kind == "enroll":
+            self.enrolled.emit(*result)
+        else:
+            self.recognized.emit(*result)
+
+    def depth(self):
+        """Number of segments waiting for a worker"""
+        return self.jobs.qsize()
+
+    def utilization(self):
+        """Fraction of worker time spent on jobs since the last call"""
+        now = time.perf_counter()
+        with self.lock:
+            busy = self.busy
+            self.busy = 0.0
+        elapsed = now - self.busy_since
+        self.busy_since = now
+        if elapsed <= 0:
+            return 0.0
+        return min(1.0, busy / (elapsed * self.workers))
+
+    def stop(self, timeout=1.0):
+        """Cancel pending work and end the worker threads"""
+        self.cancel()
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
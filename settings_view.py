@@ -365,14 +365,14 @@ class SettingsView(BaseView):
             True
         )
         
-        mic_sensitivity = voice_settings.add_slider_option("Microphone Sensitivity", 0, 100, 75)
+        self.mic_sensitivity = voice_settings.add_slider_option("Microphone Sensitivity", 0, 100, 75)
         
         language_select = voice_settings.add_select_option(
             "Language",
             ["English (US)", "English (UK)", "Spanish", "French", "German"]
         )
         
-        continuous_listening = voice_settings.add_checkbox_option(
+        self.continuous_listening = voice_settings.add_checkbox_option(
             "Continuous Listening",
             "Keep listening for commands without manually activating",
             False
@@ -387,7 +387,7 @@ class SettingsView(BaseView):
             False
         )
         
-        run_bg = system_settings.add_checkbox_option(
+        self.run_bg = system_settings.add_checkbox_option(
             "Run in Background",
             "Keep program running in the system tray",
             True
@@ -422,19 +422,31 @@ class SettingsView(BaseView):
             True
         )
         
-        camera_select = gesture_settings.add_select_option(
+        self.camera_select = gesture_settings.add_select_option(
             "Camera Source",
-            ["Default Camera", "USB Camera", "External Webcam"]
+            ["Default Camera", "USB Camera", "External Webcam", "Default + USB Camera"]
         )
         
-        gesture_sensitivity = gesture_settings.add_slider_option("Detection Sensitivity", 0, 100, 65)
+        self.gesture_sensitivity = gesture_settings.add_slider_option("Detection Sensitivity", 0, 100, 65)
         
-        show_skeleton = gesture_settings.add_checkbox_option(
+        self.show_skeleton = gesture_settings.add_checkbox_option(
             "Show Hand Skeleton",
             "Display skeletal tracking on detected hands",
             True
         )
         
+        self.capture_process = gesture_settings.add_checkbox_option(
+            "Capture in Separate Process",
+            "Run the camera and detection outside the interface process (single camera only)",
+            False
+        )
+        
+        self.gesture_clips = gesture_settings.add_checkbox_option(
+            "Save Clips on Gestures",
+            "Keep a short video of each recognized gesture (F9 always saves one)",
+            False
+        )
+        
         # Notification settings
         notification_settings = SettingsCard("Notification Settings", "Configure alerts and feedback")
         
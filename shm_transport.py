@@ -0,0 +1,332 @@
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from frame_sources import make_source, read_frames
+from gesture_pipeline import GesturePipeline
+from gesture_templates import GestureTemplateLibrary
+from hand_detector import HandDetection
+
+# Per-slot metadata: the slot's sequence counter (odd while being written),
+# stage timestamps and the detection found on the frame
+MAX_TIPS = 8
+MAX_HULL = 64
+SLOT_DTYPE = np.dtype([
+    ("seq", "i8"),
+    ("capture", "f8"),
+    ("detect", "f8"),
+    ("classify", "f8"),
+    ("valid", "i4"),
+    ("box", "i4", 4),
+    ("centroid", "f4", 2),
+    ("tips", "i4"),
+    ("tip_points", "i4", (MAX_TIPS, 2)),
+    ("hull", "i4"),
+    ("hull_points", "i4", (MAX_HULL, 2)),
+])
+
+# Header fields (int64)
+LATEST, READING, PUBLISHED = 0, 1, 2
+HEADER_FIELDS = 8
+
+
+def align(size, alignment=64):
+    """Round size up to a multiple of alignment"""
+    return (size + alignment - 1) // alignment * alignment
+
+
+class SharedFrameRing:
+    """Ring of RGB frame slots in shared memory, written by one process, read by another
+
+    The reader pins the slot it is showing in the header; the writer never
+    claims the pinned slot or the newest one, so a displayed frame stays
+    intact until the reader moves on, and frames are shown straight from
+    shared memory. Claiming and pinning both happen under a process-shared
+    lock, which is held only for those few header accesses, never while
+    pixels are copied. Each slot's sequence counter is odd while the writer
+    fills it, so a slot that is still being written is never pinned.
+    """
+    def __init__(self, memory, width, height, slots, owner, lock):
+        self.memory = memory
+        self.lock = lock
+        self.width = width
+        self.height = height
+        self.slots = slots
+        self.owner = owner
+        buffer = memory.buf
+        meta_offset = align(HEADER_FIELDS * 8)
+        frame_offset = align(meta_offset + slots * SLOT_DTYPE.itemsize)
+        self.header = np.ndarray(HEADER_FIELDS, np.int64, buffer, 0)
+        self.meta = np.ndarray(slots, SLOT_DTYPE, buffer, meta_offset)
+        self.frames = np.ndarray((slots, height, width, 3), np.uint8, buffer, frame_offset)
+        self.next_slot = 0
+        self.last_read = 0
+        self.images = None
+
+    @staticmethod
+    def size(width, height, slots):
+        """Bytes of shared memory needed for the ring"""
+        return (align(align(HEADER_FIELDS * 8) + slots * SLOT_DTYPE.itemsize) +
+                slots * width * height * 3)
+
+    @classmethod
+    def create(cls, width, height, lock, slots=4):
+        """Allocate a new ring (writer side)"""
+        memory = shared_memory.SharedMemory(create=True, size=cls.size(width, height, slots))
+        ring = cls(memory, width, height, slots, True, lock)
+        ring.header[:] = 0
+        ring.header[LATEST] = ring.header[READING] = -1
+        ring.meta[:] = np.zeros(1, SLOT_DTYPE)
+        return ring
+
+    @classmethod
+    def attach(cls, name, width, height, slots, lock):
+        """Map a ring created by another process (reader side)"""
+        return cls(shared_memory.SharedMemory(name=name), width, height, slots, False, lock)
+
+    @property
+    def name(self):
+        return self.memory.name
+
+    def begin_write(self):
+        """Claim a slot for the next frame; return its index"""
+        header = self.header
+        with self.lock:
+            # With three or more slots one is always neither newest nor pinned
+            while True:
+                slot = self.next_slot
+                self.next_slot = (slot + 1) % self.slots
+                if slot != header[LATEST] and slot != header[READING]:
+                    break
+            self.meta["seq"][slot] += 1
+        return slot
+
+    def end_write(self, slot):
+        """Publish a slot filled since begin_write"""
+        with self.lock:
+            self.meta["seq"][slot] += 1
+            self.header[LATEST] = slot
+            self.header[PUBLISHED] += 1
+
+    def published(self):
+        """Number of frames published so far"""
+        return int(self.header[PUBLISHED])
+
+    def acquire_latest(self):
+        """Pin the newest frame for display; return its slot, or None if nothing new"""
+        header = self.header
+        with self.lock:
+            published = int(header[PUBLISHED])
+            slot = int(header[LATEST])
+            if slot < 0 or published == self.last_read or self.meta["seq"][slot] % 2:
+                return None
+            header[READING] = slot
+        self.last_read = published
+        return slot
+
+    def image(self, slot):
+        """Persistent QImage wrapping a slot's pixels (reader side)"""
+        if self.images is None:
+            stride = self.width * 3
+            self.images = [QImage(self.frames[i].data, self.width, self.height, stride,
+                                  QImage.Format_RGB888) for i in range(self.slots)]
+        return self.images[slot]
+
+    def detection(self, slot):
+        """Rebuild the HandDetection stored with a slot, or None"""
+        meta = self.meta[slot]
+        if not meta["valid"]:
+            return None
+        hull = meta["hull_points"][:meta["hull"]].reshape(-1, 1, 2).copy()
+        x, y, w, h = (int(v) for v in meta["box"])
+        return HandDetection((x, y, w, h), tuple(float(v) for v in meta["centroid"]),
+                             hull, hull, meta["tip_points"][:meta["tips"]].copy(), float(w * h))
+
+    def store_detection(self, slot, detection):
+        """Write a detection (or None) into a slot's metadata (writer side)"""
+        meta = self.meta[slot]
+        if detection is None:
+            meta["valid"] = 0
+            return
+        meta["valid"] = 1
+        meta["box"] = detection.box
+        meta["centroid"] = detection.centroid
+        tips = np.asarray(detection.fingertips).reshape(-1, 2)[:MAX_TIPS]
+        meta["tips"] = len(tips)
+        meta["tip_points"][:len(tips)] = tips
+        hull = detection.hull.reshape(-1, 2)
+        if len(hull) > MAX_HULL:
+            hull = hull[np.linspace(0, len(hull) - 1, MAX_HULL).astype(int)]
+        meta["hull"] = len(hull)
+        meta["hull_points"][:len(hull)] = hull
+
+    def close(self):
+        """Unmap the ring; the writer also frees the shared memory"""
+        # Views into the buffer must go before it can be unmapped
+        self.images = None
+        self.header = self.meta = self.frames = None
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+def capture_process(device, pyramid_level, events, stop_event, lock, slots=4):
+    """Capture, detect and publish frames into a SharedFrameRing (runs in a child process)"""
+    source = make_source(device)
+    if not source.open():
+        events.put(("error", "Could not open camera"))
+        return
+    ret, frame = source.read()
+    if not ret:
+        source.release()
+        events.put(("error", "Camera delivered no frames"))
+        return
+
+    height, width = frame.shape[:2]
+    ring = SharedFrameRing.create(width, height, lock, slots)
+    events.put(("opened", (ring.name, width, height, slots)))
+
+    pipeline = GesturePipeline(pyramid_level)
+    pipeline.classifier.templates = GestureTemplateLibrary()
+    try:
+        for frame, captured in read_frames(source, stop_event,
+                                           lambda kind, value: events.put((kind, value)), frame):
+            if frame.shape[:2] != (height, width):
+                continue
+            result = pipeline.process(frame, captured)
+            slot = ring.begin_write()
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=ring.frames[slot])
+            meta = ring.meta[slot]
+            meta["capture"] = captured
+            meta["detect"] = pipeline.stamps["detect"]
+            meta["classify"] = pipeline.stamps["classify"]
+            ring.store_detection(slot, result.detection)
+            ring.end_write(slot)
+            if result.gesture is not None:
+                events.put(("gesture", result.gesture))
+    finally:
+        source.release()
+        # Tell the GUI to unmap before the memory goes away
+        events.put(("closed", None))
+        ring.close()
+
+
+class ShmCapture(QObject):
+    """GUI-side handle on a capture process that shares frames through memory
+
+    Capture, detection and the BGR to RGB conversion all happen in the
+    child process, so the GUI process only wraps shared slots in QImages and
+    paints them. Frame notifications come from polling the ring's publish
+    counter; gestures and status arrive as small events on a queue.
+    """
+
+    opened = pyqtSignal(bool)
+    frame_ready = pyqtSignal()
+    gesture_detected = pyqtSignal(str)
+    fps_updated = pyqtSignal(float)
+    capture_error = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.events = None
+        self.stop_event = None
+        self.lock = None
+        self.ring = None
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def start(self, device, pyramid_level=1):
+        """Start the capture process for a camera device"""
+        self.stop()
+        self.events = self.context.Queue()
+        self.stop_event = self.context.Event()
+        self.lock = self.context.Lock()
+        self.process = self.context.Process(
+            target=capture_process,
+            args=(device, pyramid_level, self.events, self.stop_event, self.lock),
+            daemon=True)
+        self.process.start()
+        # Poll faster than the fastest camera so frames are picked up promptly
+        self.poll_timer.start(4)
+
+    def is_running(self):
+        return self.process is not None and self.process.is_alive()
+
+    def poll(self):
+        """Forward process events and announce new frames"""
+        while self.events is not None:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "opened":
+                self.ring = SharedFrameRing.attach(*value, self.lock)
+                self.opened.emit(True)
+            elif kind == "gesture":
+                self.gesture_detected.emit(value)
+            elif kind == "fps":
+                self.fps_updated.emit(value)
+            elif kind == "closed":
+                # The process ended on its own; the handler is expected to stop us
+                self.capture_error.emit("Capture process stopped")
+                self.release_ring()
+            elif kind == "error":
+                if self.ring is None:
+                    self.opened.emit(False)
+                else:
+                    self.capture_error.emit(value)
+        if self.ring is not None and self.ring.published() != self.ring.last_read:
+            self.frame_ready.emit()
+
+    def take_frame(self):
+        """Return (QImage, detection, stamps) for the newest frame, or None
+
+        The QImage shows shared memory directly and stays valid until the
+        next call.
+        """
+        if self.ring is None:
+            return None
+        slot = self.ring.acquire_latest()
+        if slot is None:
+            return None
+        meta = self.ring.meta[slot]
+        stamps = {"capture": float(meta["capture"]), "detect": float(meta["detect"]),
+                  "classify": float(meta["classify"])}
+        return self.ring.image(slot), self.ring.detection(slot), stamps
+
+    def release_ring(self):
+        """Unmap the shared frames"""
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def stop(self, timeout=1.0):
+        """Stop the capture process and unmap its frames"""
+        self.poll_timer.stop()
+        self.release_ring()
+        if self.stop_event is not None:
+            self.stop_event.set()
+        if self.process is not None:
+            # Drain events so the child does not block flushing its queue
+            deadline = time.monotonic() + timeout
+            while self.process.is_alive() and time.monotonic() < deadline:
+                try:
+                    self.events.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            self.process.join(0.1)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.events is not None:
+            self.events.close()
+            self.events = None
+        self.stop_event = None
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from audio_features import MfccExtractor, StreamingMfcc
+
+RATE = 16000
+
+
+def speech_like(seconds=1.5):
+    """Gliding harmonics with a little noise, as in benchmark_features"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / RATE
+    audio = sum(np.sin(k * phase) / k for k in range(1, 8)) * 0.2
+    audio += np.random.default_rng(0).normal(scale=0.01, size=len(t))
+    return audio.astype(np.float32)
+
+
+@pytest.mark.parametrize("chunk", [160, 512, 777, 4000])
+def test_streaming_matches_one_pass_compute(chunk):
+    samples = speech_like()
+    # A small starting capacity also exercises the matrix growing
+    stream = StreamingMfcc(RATE, capacity=8)
+    for index in range(0, len(samples), chunk):
+        stream.push(samples[index:index + chunk])
+
+    expected = MfccExtractor(RATE).compute(samples)
+    result = stream.result()
+    assert result.shape == expected.shape
+    np.testing.assert_allclose(result - result.mean(axis=0), expected, atol=1e-4)
+
+
+def test_reset_starts_a_new_utterance():
+    samples = speech_like(0.5)
+    stream = StreamingMfcc(RATE)
+    stream.push(speech_like(0.3)[::-1])
+    stream.reset()
+    stream.push(samples)
+
+    reference = MfccExtractor(RATE)
+    np.testing.assert_allclose(stream.result(), reference.features(reference.frames(samples)),
+                               atol=1e-4)
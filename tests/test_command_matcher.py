@@ -0,0 +1,49 @@
+from command_matcher import CommandMatcher, bounded_distance
+
+
+def make_matcher(tmp_path):
+    # A path that does not exist yet means no user aliases
+    return CommandMatcher(path=str(tmp_path / "aliases.json"))
+
+
+def test_exact_and_filler_words(tmp_path):
+    matcher = make_matcher(tmp_path)
+    assert matcher.match("Open Browser")[0] == "Open Browser"
+    assert matcher.match("open the browser please")[0] == "Open Browser"
+
+
+def test_misheard_words_still_match(tmp_path):
+    matcher = make_matcher(tmp_path)
+    assert matcher.match("volume op")[0] == "Volume Up"
+    assert matcher.match("scrol dwn")[0] == "Scroll Down"
+
+
+def test_default_and_user_aliases(tmp_path):
+    matcher = make_matcher(tmp_path)
+    command, _, phrase = matcher.match("louder")
+    assert (command, phrase) == ("Volume Up", "louder")
+
+    matcher.add_alias("boost the sound", "Volume Up")
+    matcher.add_alias("morning routine", "Start Day Macro")
+    assert matcher.match("boost sound")[0] == "Volume Up"
+    assert matcher.match("morning routine")[0] == "Start Day Macro"
+
+    matcher.save()
+    reloaded = make_matcher(tmp_path)
+    assert reloaded.match("morning routine")[0] == "Start Day Macro"
+    assert reloaded.remove_alias("morning routine")
+    assert reloaded.match("morning routine")[0] is None
+
+
+def test_unrelated_text_has_no_match(tmp_path):
+    matcher = make_matcher(tmp_path)
+    command, score, phrase = matcher.match("what a lovely afternoon")
+    assert command is None and phrase is None
+    assert score < matcher.min_score
+    assert matcher.match("the please")[0] is None
+
+
+def test_bounded_distance_gives_up_past_the_bound():
+    assert bounded_distance("volume", "volume", 1) == 0
+    assert bounded_distance("op", "up", 1) == 1
+    assert bounded_distance("browser", "window", 2) is None
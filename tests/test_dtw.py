@@ -0,0 +1,27 @@
+import numpy as np
+
+from dtw import dtw_costs, envelopes, lb_keogh
+
+
+def test_lb_keogh_never_exceeds_banded_dtw():
+    rng = np.random.default_rng(0)
+    templates = rng.normal(size=(40, 32, 2)).cumsum(axis=1).astype(np.float32)
+    for radius in (1, 4, 8):
+        lower, upper = envelopes(templates, radius)
+        for _ in range(5):
+            query = rng.normal(size=(32, 2)).cumsum(axis=0).astype(np.float32)
+            bounds = lb_keogh(query, lower, upper)
+            costs = dtw_costs(query, templates, radius)
+            assert np.all(bounds <= costs * (1 + 1e-5))
+
+
+def test_dtw_aligns_time_shifted_paths():
+    t = np.linspace(0, 2 * np.pi, 32)
+    template = np.stack([np.cos(t), np.sin(t)], axis=1).astype(np.float32)
+    shifted = np.concatenate([template[:3], template[:-3]])
+
+    costs = dtw_costs(template, np.stack([template, shifted]), radius=4)
+    assert costs[0] == 0.0
+    # Warping absorbs most of the delay that a point-by-point comparison pays for
+    lockstep = ((template - shifted) ** 2).sum()
+    assert costs[1] < 0.5 * lockstep
@@ -0,0 +1,35 @@
+import cv2
+import numpy as np
+import pytest
+
+from frame_sources import SyntheticSource
+from gesture_classifier import GestureClassifier
+from gesture_pipeline import GesturePipeline
+
+
+def swipe_frames(count=24, step=20):
+    """Two-fingered hand sweeping from right to left across the frame"""
+    source = SyntheticSource()
+    frames = []
+    for index in range(count):
+        frame = source.background.copy()
+        cx, cy = 560 - index * step, 300
+        cv2.circle(frame, (cx, cy), 50, source.SKIN_COLOR, -1)
+        # Two fingers, so the hand never counts as an open palm
+        for tx, ty in np.array([cx, cy]) + 120 * source.finger_dirs[1:3]:
+            cv2.line(frame, (cx, cy), (int(tx), int(ty)), source.SKIN_COLOR, 16)
+        frames.append(frame)
+    return frames
+
+
+@pytest.mark.parametrize("stride", [1, 2, 3])
+def test_swipe_recognized_when_detection_is_strided(stride):
+    pipeline = GesturePipeline(pyramid_level=1)
+    gestures = []
+    for index, frame in enumerate(swipe_frames()):
+        result = pipeline.process(frame, index / 30, detect=index % stride == 0)
+        if result.gesture is not None:
+            gestures.append(result.gesture)
+
+    # Image left is the user's right with the default mirrored classifier
+    assert gestures == [GestureClassifier.SWIPE_RIGHT]
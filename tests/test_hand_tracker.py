@@ -0,0 +1,38 @@
+import numpy as np
+
+from hand_detector import HandDetection
+from hand_tracker import HandTracker
+
+
+def make_detection(cx, cy, size=80):
+    x, y = cx - size // 2, cy - size // 2
+    contour = np.array([[[x, y]], [[x + size, y]], [[x + size, y + size]], [[x, y + size]]], np.int32)
+    return HandDetection((x, y, size, size), (float(cx), float(cy)), contour, contour,
+                         np.zeros((0, 2), np.int32), float(size * size))
+
+
+def textured_frame(width=640, height=480):
+    return np.random.default_rng(0).integers(0, 255, (height, width), np.uint8)
+
+
+def test_track_predicted_off_frame_falls_back_to_detection():
+    gray = textured_frame()
+    tracker = HandTracker()
+    tracker.correct(make_detection(600, 240), gray, 0.0)
+    # A fast hand moving right: after a long gap the prediction is off the frame
+    tracker.kalman.statePost[4, 0] = 234.0 * 4
+    tracker.since_detection = 0
+    tracker.interval = 6
+
+    assert tracker.track(gray, 0.4) is False
+    assert tracker.needs_detection()
+
+
+def test_track_follows_hand_inside_frame():
+    gray = textured_frame()
+    tracker = HandTracker()
+    tracker.correct(make_detection(320, 240), gray, 0.0)
+
+    assert tracker.track(gray, 0.033) is True
+    cx, cy = tracker.estimate().centroid
+    assert abs(cx - 320) < 4 and abs(cy - 240) < 4
@@ -0,0 +1,62 @@
+import threading
+
+import numpy as np
+import pytest
+
+from shm_transport import LATEST, READING, SharedFrameRing
+
+
+@pytest.fixture(params=[3, 4])
+def rings(request):
+    lock = threading.Lock()
+    writer = SharedFrameRing.create(16, 8, lock, request.param)
+    reader = SharedFrameRing.attach(writer.name, 16, 8, request.param, lock)
+    yield writer, reader
+    reader.close()
+    writer.close()
+
+
+def publish(writer, value):
+    slot = writer.begin_write()
+    writer.frames[slot] = value
+    writer.end_write(slot)
+    return slot
+
+
+def test_writer_never_claims_the_newest_or_pinned_slot(rings):
+    writer, reader = rings
+    rng = np.random.default_rng(0)
+    pinned = None
+    for value in range(1, 300):
+        latest = int(writer.header[LATEST])
+        slot = writer.begin_write()
+        assert slot != latest
+        assert slot != pinned
+        assert writer.meta["seq"][slot] % 2 == 1
+        writer.frames[slot] = value % 256
+        writer.end_write(slot)
+        assert writer.meta["seq"][slot] % 2 == 0
+
+        # The reader picks up new frames at random moments
+        if rng.random() < 0.4:
+            acquired = reader.acquire_latest()
+            assert acquired == slot == int(reader.header[READING])
+            pinned = acquired
+            assert (reader.frames[pinned] == value % 256).all()
+
+
+def test_pinned_frame_survives_later_writes(rings):
+    writer, reader = rings
+    publish(writer, 7)
+    pinned = reader.acquire_latest()
+    for value in range(20):
+        publish(writer, value + 100)
+    assert (reader.frames[pinned] == 7).all()
+    # The newest frame is handed out once, then nothing until the next one
+    assert (reader.frames[reader.acquire_latest()] == 119).all()
+    assert reader.acquire_latest() is None
+
+
+def test_nothing_to_acquire_before_the_first_frame(rings):
+    _, reader = rings
+    assert reader.acquire_latest() is None
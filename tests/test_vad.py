@@ -0,0 +1,57 @@
+import numpy as np
+
+from audio_features import StreamingMfcc
+from vad import VoiceActivityDetector
+
+RATE = 16000
+
+
+def tone_in_noise(before=0.6, tone=0.8, after=0.8):
+    """Quiet noise with a 220 Hz tone in the middle; return (samples, tone start, tone end)"""
+    rng = np.random.default_rng(0)
+    samples = rng.normal(scale=0.002, size=int((before + tone + after) * RATE)).astype(np.float32)
+    start, end = int(before * RATE), int((before + tone) * RATE)
+    t = np.arange(end - start) / RATE
+    samples[start:end] += 0.3 * np.sin(2 * np.pi * 220 * t)
+    return samples, start, end
+
+
+def run_detector(detector, samples, chunk=512):
+    segments = []
+    for index in range(0, len(samples), chunk):
+        segments.extend(detector.process(samples[index:index + chunk]))
+    return segments
+
+
+def test_tone_becomes_one_segment_with_preroll_and_hangover():
+    samples, start, end = tone_in_noise()
+    detector = VoiceActivityDetector(RATE)
+    segments = run_detector(detector, samples)
+
+    assert len(segments) == 1
+    segment, features = segments[0]
+    assert features is None
+    # Frames are copied whole from the input, so the segment can be located in it
+    offset = int(np.flatnonzero(samples == segment[0])[0])
+    assert np.array_equal(samples[offset:offset + len(segment)], segment)
+
+    frame = detector.frame_size
+    preroll = detector.preroll.maxlen * frame
+    hangover = detector.hangover_frames * frame
+    assert start - preroll - frame <= offset <= start
+    assert end <= offset + len(segment) <= end + hangover + frame
+
+
+def test_segment_features_match_one_pass_extraction():
+    samples, _, _ = tone_in_noise()
+    stream = StreamingMfcc(RATE)
+    segments = run_detector(VoiceActivityDetector(RATE, features=stream), samples)
+
+    segment, features = segments[0]
+    expected = stream.features(stream.frames(segment))
+    np.testing.assert_allclose(features, expected, atol=1e-3)
+
+
+def test_noise_alone_gives_no_segment():
+    samples = np.random.default_rng(1).normal(scale=0.002, size=2 * RATE).astype(np.float32)
+    assert run_detector(VoiceActivityDetector(RATE), samples) == []
@@ -0,0 +1,139 @@
+from collections import deque
+
+import numpy as np
+
+
+def sensitivity_to_margin(sensitivity):
+    """Map the 0-100 Microphone Sensitivity setting to dB above the noise floor"""
+    return 18.0 - 0.14 * max(0, min(100, sensitivity))
+
+
+class VoiceActivityDetector:
+    """Streaming voice activity detector that cuts audio into speech segments
+
+    Audio is split into short frames. For every frame the energy, the
+    zero-crossing rate and the spectral flatness are computed, all at once
+    for a whole chunk with NumPy. A frame counts as speech when its energy
+    is far enough above an adaptive noise floor and its spectrum looks like
+    a voice rather than broadband noise. Speech starts after a few such
+    frames in a row and ends after a hangover of quiet frames. A short
+    pre-roll from before the onset is kept so the first syllable is not
+    clipped. Only whole segments leave the detector.
+
+    Given a StreamingMfcc, the detector feeds it each speech frame as it is
+    accepted, so a segment's features are ready the moment it ends.
+    """
+    def __init__(self, sample_rate=16000, frame_ms=16, sensitivity=75, onset_frames=3,
+                 hangover_ms=320, preroll_ms=200, max_segment_s=6.0, features=None):
+        self.sample_rate = sample_rate
+        self.feature_stream = features
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.onset_frames = onset_frames
+        self.hangover_frames = max(1, int(hangover_ms / frame_ms))
+        self.max_segment_frames = int(max_segment_s * 1000 / frame_ms)
+        self.preroll = deque(maxlen=max(1, int(preroll_ms / frame_ms)))
+        self.window = np.hanning(self.frame_size).astype(np.float32)
+        # Broadband noise is flat (close to 1); voiced speech is peaky
+        self.max_flatness = 0.45
+        # Frames far above the floor pass even when noisy (fricatives, plosives)
+        self.loud_margin = 12.0
+        self.set_sensitivity(sensitivity)
+        self.frames = 0
+        self.speech_frames = 0
+        self.reset()
+
+    def set_sensitivity(self, sensitivity):
+        """Apply the Microphone Sensitivity setting (higher catches quieter speech)"""
+        self.margin = sensitivity_to_margin(sensitivity)
+
+    def reset(self):
+        """Forget the current segment and the noise estimate"""
+        self.pending = np.zeros(0, np.float32)
+        self.noise_floor = None
+        self.in_speech = False
+        self.run = 0
+        self.quiet = 0
+        self.segment = []
+        self.preroll.clear()
+
+    def features(self, frames):
+        """Return (energy dB, zero-crossing rate, spectral flatness) for (n, frame_size) frames"""
+        energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        power = np.abs(np.fft.rfft(frames * self.window, axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return energy, zcr, flatness
+
+    def process(self, samples):
+        """Feed a chunk of samples; return a list of finished (samples, features) segments
+
+        features is the segment's raw MFCC matrix, or None without a feature stream.
+        """
+        samples = np.concatenate([self.pending, samples]) if len(self.pending) else samples
+        count = len(samples) // self.frame_size
+        self.pending = samples[count * self.frame_size:].astype(np.float32)
+        if not count:
+            return []
+        frames = samples[:count * self.frame_size].reshape(count, self.frame_size)
+        energy, zcr, flatness = self.features(frames)
+        if self.noise_floor is None:
+            self.noise_floor = float(energy.min())
+
+        finished = []
+        for frame, db, crossings, flat in zip(frames, energy, zcr, flatness):
+            above = db - self.noise_floor
+            speech = above > self.margin and (flat < self.max_flatness or crossings < 0.4 or
+                                              above > self.margin + self.loud_margin)
+            self.frames += 1
+            if not speech:
+                # Track the floor quickly downwards and slowly upwards
+                rate = 0.1 if db < self.noise_floor else 0.01
+            else:
+                # Creep up even through "speech" so a steady new noise (a fan) is absorbed
+                rate = 0.002
+            self.noise_floor += rate * (db - self.noise_floor)
+            segment = self.step(frame, speech)
+            if segment is not None:
+                finished.append(segment)
+        return finished
+
+    def step(self, frame, speech):
+        """Advance the speech state machine by one frame; return a finished (samples, features)"""
+        if not self.in_speech:
+            self.preroll.append(frame.copy())
+            self.run = self.run + 1 if speech else 0
+            if self.run >= self.onset_frames:
+                self.in_speech = True
+                self.quiet = 0
+                self.segment = list(self.preroll)
+                self.preroll.clear()
+                self.speech_frames += len(self.segment)
+                if self.feature_stream is not None:
+                    self.feature_stream.reset()
+                    self.feature_stream.push(np.concatenate(self.segment))
+            return None
+
+        self.segment.append(frame.copy())
+        if self.feature_stream is not None:
+            self.feature_stream.push(frame)
+        self.speech_frames += 1
+        self.quiet = 0 if speech else self.quiet + 1
+        if self.quiet >= self.hangover_frames or len(self.segment) >= self.max_segment_frames:
+            segment = np.concatenate(self.segment)
+            features = None
+            if self.feature_stream is not None:
+                features = self.feature_stream.result().copy()
+            self.in_speech = False
+            self.run = 0
+            self.segment = []
+            return segment, features
+        return None
+
+    def speech_ratio(self):
+        """Fraction of audio passed on as speech"""
+        return self.speech_frames / self.frames if self.frames else 0.0
+
+    def silence_ratio(self):
+        """Fraction of audio the recognizer never sees"""
+        return 1.0 - self.speech_ratio() if self.frames else 0.0
@@ -1,4 +1,6 @@
 
+import time
+
 import cv2
 import numpy as np
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
@@ -6,17 +8,23 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPixmap, QImage
 from views.base_view import BaseView
+from camera_capture import CaptureWorker
+from gesture_pipeline import GesturePipeline
+from hand_overlay import HandOverlay
+from frame_display import FrameView
 
 class GestureControlView(BaseView):
     """View for the gesture control functionality"""
     
+    # Number of entries kept in the command history
+    MAX_HISTORY = 100
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setup_ui()
         self.is_detecting = False
-        self.camera_timer = QTimer()
-        self.camera_timer.timeout.connect(self.update_camera_feed)
-        self.cap = None
+        self.capture_worker = None
+        self.gesture_pipeline = GesturePipeline()
         
     def setup_ui(self):
         """Set up the UI components"""
@@ -38,11 +46,10 @@ class GestureControlView(BaseView):
         left_layout = QVBoxLayout()
         
         # Camera view
-        self.camera_label = QLabel()
+        self.camera_label = FrameView()
         self.camera_label.setMinimumSize(400, 300)
-        self.camera_label.setAlignment(Qt.AlignCenter)
-        self.camera_label.setStyleSheet("background-color: #222; border-radius: 10px;")
         self.camera_label.setText("Camera feed will appear here")
+        self.camera_label.overlay = HandOverlay()
         left_layout.addWidget(self.camera_label)
         
         # Status indicator
@@ -115,53 +122,87 @@ class GestureControlView(BaseView):
                 item.setForeground(Qt.red)
             self.command_list.addItem(item)
 
+    def add_command(self, command, status="success"):
+        """Add a recognized gesture to the top of the command history"""
+        item = QListWidgetItem(f"{time.strftime('%I:%M %p')} - {command}")
+        if status == "success":
+            item.setForeground(Qt.green)
+        else:
+            item.setForeground(Qt.red)
+        self.command_list.insertItem(0, item)
+        
+        # Keep the history bounded so adding an entry stays cheap
+        if self.command_list.count() > self.MAX_HISTORY:
+            self.command_list.takeItem(self.command_list.count() - 1)
+
     def toggle_detection(self):
         """Toggle gesture detection on/off"""
         if not self.is_detecting:
-            # Start detection
-            self.cap = cv2.VideoCapture(0)
-            if not self.cap.isOpened():
-                self.camera_label.setText("Error: Could not open camera")
-                return
-                
+            # Start detection; the device is opened on the capture thread
+            self.gesture_pipeline.reset()
+            self.capture_worker = CaptureWorker(0, self)
+            self.capture_worker.opened.connect(self.on_camera_opened)
+            self.capture_worker.frame_ready.connect(self.update_camera_feed)
+            self.capture_worker.finished.connect(self.on_capture_finished)
+            self.capture_worker.finished.connect(self.capture_worker.deleteLater)
+            self.capture_worker.start()
+            
             self.is_detecting = True
             self.toggle_button.setText("Stop Camera")
-            self.status_indicator.setText("Active")
-            self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
-            self.camera_timer.start(30)  # update every 30ms
+            self.status_indicator.setText("Starting...")
+            self.camera_label.setText("Opening camera...")
         else:
             # Stop detection
-            self.camera_timer.stop()
-            if self.cap:
-                self.cap.release()
-                self.cap = None
+            self.stop_capture()
             self.is_detecting = False
             self.toggle_button.setText("Start Camera")
             self.status_indicator.setText("Inactive")
             self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
             self.camera_label.setText("Camera feed will appear here")
 
+    def on_camera_opened(self, ok):
+        """Update the UI once the capture thread has tried to open the camera"""
+        if not self.is_detecting:
+            return
+        if not ok:
+            self.toggle_detection()
+            self.camera_label.setText("Error: Could not open camera")
+            return
+            
+        self.status_indicator.setText("Active")
+        self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
+
+    def on_capture_finished(self):
+        """Reset the UI if the capture thread stopped on its own (camera lost)"""
+        if self.is_detecting and self.sender() is self.capture_worker:
+            self.toggle_detection()
+
+    def stop_capture(self):
+        """Stop the capture thread and release the camera"""
+        if self.capture_worker:
+            worker = self.capture_worker
+            self.capture_worker = None
+            worker.frame_ready.disconnect(self.update_camera_feed)
+            worker.stop()
+
     def update_camera_feed(self):
         """Update the camera feed with gesture detection visualization"""
-        if self.cap:
-            ret, frame = self.cap.read()
-            if ret:
-                # Convert to RGB for display (OpenCV uses BGR)
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Here you would add the actual hand gesture detection
-                # For now, we'll just add a placeholder rectangle
-                cv2.rectangle(frame, (100, 100), (300, 300), (139, 92, 246), 2)
-                
-                # Convert the image to Qt format
-                h, w, ch = frame.shape
-                bytes_per_line = ch * w
-                qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(qt_image)
-                self.camera_label.setPixmap(pixmap)
+        if not self.capture_worker:
+            return
+        latest = self.capture_worker.take_frame()
+        if latest is not None:
+            frame, timestamp = latest
+            result = self.gesture_pipeline.process(frame, timestamp)
+            detection = result.detection
+            
+            # Convert to RGB into the view's preallocated display buffer;
+            # the hand is painted over it as vectors
+            self.camera_label.overlay.set_detection(detection)
+            self.camera_label.setFrame(frame)
+            if result.gesture is not None:
+                self.add_command(result.gesture)
 
     def closeEvent(self, event):
         """Handle close event to release the camera"""
-        if self.cap:
-            self.cap.release()
+        self.stop_capture()
         super().closeEvent(event)
@@ -5,6 +5,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton,
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QColor
 from views.base_view import BaseView
+from voice_command_view import VoiceVisualizer
 
 class VoiceCommandView(BaseView):
     """View for the voice command functionality"""
@@ -51,9 +52,7 @@ class VoiceCommandView(BaseView):
         mic_layout.addLayout(status_layout)
         
         # Visualizer
-        self.visualizer_widget = QWidget()
-        self.visualizer_widget.setMinimumHeight(80)
-        self.visualizer_widget.setStyleSheet("background-color: #1E212A; border-radius: 5px;")
+        self.visualizer_widget = VoiceVisualizer(20)
         mic_layout.addWidget(self.visualizer_widget)
         
         # Recognized text display
@@ -139,6 +138,7 @@ class VoiceCommandView(BaseView):
             self.status_indicator.setText("Listening")
             self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
             self.text_display.setText("Listening...")
+            self.visualizer_widget.setActive(True)
             self.visualizer_timer.start(50)
             # Here you would initialize the speech recognition
         else:
@@ -148,6 +148,7 @@ class VoiceCommandView(BaseView):
             self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
             self.text_display.setText("Click the microphone to start")
             self.visualizer_timer.stop()
+            self.visualizer_widget.setActive(False)
             self.visualizer_levels = []
             self.update_visualizer()
             # Here you would stop the speech recognition
@@ -162,47 +163,5 @@ class VoiceCommandView(BaseView):
         else:
             self.visualizer_levels = [5] * 20  # Flat line when not listening
             
-        # Force a repaint to draw the visualizer
-        self.visualizer_widget.update()
-        
-    def paintEvent(self, event):
-        """Handle painting the visualizer"""
-        super().paintEvent(event)
-        
-        if hasattr(self, 'visualizer_widget'):
-            from PyQt5.QtGui import QPainter, QColor
-            
-            painter = QPainter(self.visualizer_widget)
-            painter.setRenderHint(QPainter.Antialiasing)
-            
-            width = self.visualizer_widget.width()
-            height = self.visualizer_widget.height()
-            
-            # If no levels yet, initialize flat
-            if not self.visualizer_levels:
-                self.visualizer_levels = [5] * 20
-            
-            # Calculate bar width and spacing
-            num_bars = len(self.visualizer_levels)
-            bar_width = (width - (num_bars - 1) * 2) / num_bars
-            
-            # Draw the visualization bars
-            for i, level in enumerate(self.visualizer_levels):
-                # Map level to height
-                bar_height = (level / 100) * height
-                
-                # Set color based on level
-                if self.is_listening:
-                    color = QColor(139, 92, 246)  # Purple for active
-                else:
-                    color = QColor(100, 100, 100)  # Gray for inactive
-                
-                painter.setPen(Qt.NoPen)
-                painter.setBrush(color)
-                
-                x = i * (bar_width + 2)
-                y = height - bar_height
-                
-                painter.drawRoundedRect(x, y, bar_width, bar_height, 2, 2)
-            
-            painter.end()
+        # Shown on the visualizer's next frame
+        self.visualizer_widget.setLevels(self.visualizer_levels)
@@ -1,70 +1,221 @@
 
-import numpy as np
+import time
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
-                             QHBoxLayout, QListWidget, QListWidgetItem, QFrame)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QPainter, QPen
+                             QHBoxLayout, QListWidget, QListWidgetItem, QFrame,
+                             QInputDialog, QLineEdit)
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer, QRect, QRectF
+from PyQt5.QtGui import QBrush, QColor, QPainter, QPixmap, QRegion
 from base_view import BaseView
+from audio_engine import AudioEngine
+from command_matcher import CommandMatcher
+from keyword_spotter import COMMANDS, KeywordSpotter
+from recognition_worker import RecognitionWorker
 
 class VoiceVisualizer(QWidget):
-    """Custom widget for voice visualization"""
-    def __init__(self, parent=None):
+    """Custom widget for voice visualization
+
+    Levels may arrive at any rate, either pushed with setLevels or pulled
+    from a level source; they only land in a back buffer. A frame timer
+    running at the screen's refresh rate (or max_fps, if lower) resamples
+    the newest levels to the bar count, compares the bar heights with the
+    ones on screen and repaints just the columns that changed. The
+    background and the empty bar slots are drawn once into a cached
+    pixmap, and the colours are built once, so a repaint only blits the
+    background and fills the changed bars.
+    """
+
+    ACTIVE_BRUSH = QBrush(QColor(139, 92, 246))  # Purple for active
+    INACTIVE_BRUSH = QBrush(QColor(100, 100, 100))  # Gray for inactive
+    BACKGROUND = QColor(30, 33, 42)
+    SLOT = QColor(42, 47, 60)
+    SPACING = 2
+
+    def __init__(self, bars=12, max_fps=None, parent=None):
         super().__init__(parent)
         self.setMinimumHeight(80)
-        self.levels = [5] * 12
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.active = False
-        
+        self.max_fps = max_fps
+        # Whether the widget is on screen; no frames are drawn otherwise
+        self.rendering = True
+        # Callable returning the newest levels, polled once per frame
+        self.level_source = None
+        self.pending = None
+        self.background = None
+        self.bar_left = np.zeros(0, int)
+        self.bar_right = np.zeros(0, int)
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.flush)
+        # Bars repainted so far, to check that unchanged bars are skipped
+        self.bars_painted = 0
+        self.setBars(bars)
+
+    def setBars(self, bars):
+        """Change the number of bars"""
+        self.bars = bars
+        self.levels = np.full(bars, 5.0, np.float32)
+        self.heights = np.zeros(bars, int)
+        self.layout_bars()
+
     def setActive(self, active):
         """Set active state and update visualization"""
         self.active = active
+        self.update_timer()
         self.update()
-        
+
+    def setRendering(self, rendering):
+        """Start or stop drawing frames, e.g. while the view is hidden"""
+        self.rendering = rendering
+        self.update_timer()
+
+    def setLevelSource(self, source):
+        """Poll source() for levels on every frame; None stops polling"""
+        self.level_source = source
+        self.update_timer()
+
     def setLevels(self, levels):
-        """Update audio level data"""
+        """Update audio level data; it is shown on the next frame"""
+        self.pending = levels
+        self.update_timer()
+
+    def frame_interval(self):
+        """Milliseconds between frames: the screen's refresh or the max_fps cap"""
+        screen = self.screen() if hasattr(self, "screen") else None
+        refresh = screen.refreshRate() if screen is not None else 60.0
+        fps = min(refresh, self.max_fps) if self.max_fps else refresh
+        return max(1, int(1000 / max(1.0, fps)))
+
+    def update_timer(self):
+        """Run the frame timer only while there is something to show"""
+        busy = self.level_source is not None or self.pending is not None
+        if self.rendering and busy:
+            if not self.frame_timer.isActive():
+                self.frame_timer.start(self.frame_interval())
+        else:
+            self.frame_timer.stop()
+
+    def flush(self):
+        """Frame tick: take the newest levels and repaint the bars that changed"""
+        levels = self.level_source() if self.level_source is not None else self.pending
+        self.pending = None
+        if levels is None:
+            self.update_timer()
+            return
+        levels = np.asarray(levels, np.float32)
+        if len(levels) != self.bars:
+            # Decimate (or stretch) to the bar count, keeping peaks visible
+            edges = np.linspace(0, len(levels), self.bars + 1).astype(int)
+            edges[1:] = np.maximum(edges[1:], edges[:-1] + 1)
+            levels = np.maximum.reduceat(levels, np.minimum(edges[:-1], len(levels) - 1))
         self.levels = levels
-        self.update()
-        
+
+        heights = (np.clip(levels, 0, 100) * (self.height() / 100.0)).astype(int)
+        changed = np.flatnonzero(heights != self.heights)
+        if len(changed):
+            region = QRegion()
+            # One rectangle per run of neighbouring changed bars
+            breaks = np.flatnonzero(np.diff(changed) > 1)
+            starts = changed[np.r_[0, breaks + 1]]
+            ends = changed[np.r_[breaks, len(changed) - 1]]
+            for start, end in zip(starts, ends):
+                top = self.height() - max(heights[start:end + 1].max(), self.heights[start:end + 1].max())
+                left = self.bar_left[start]
+                region += QRect(left, top, self.bar_right[end] - left, self.height() - top)
+            self.heights = heights
+            self.update(region)
+        self.update_timer()
+
+    def layout_bars(self):
+        """Recompute the bar columns and the cached background for the current size"""
+        width = self.width()
+        positions = np.linspace(0, width + self.SPACING, self.bars + 1)
+        self.bar_left = positions[:-1].astype(int)
+        self.bar_right = np.maximum(self.bar_left + 1, (positions[1:] - self.SPACING).astype(int))
+        self.heights = (np.clip(self.levels, 0, 100) * (self.height() / 100.0)).astype(int)
+        self.background = None
+
+    def build_background(self):
+        """Draw the static background and bar slots into a pixmap"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self.BACKGROUND)
+        painter = QPainter(pixmap)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.SLOT)
+        for left, right in zip(self.bar_left, self.bar_right):
+            painter.drawRect(int(left), 0, int(right - left), self.height())
+        painter.end()
+        self.background = pixmap
+
+    def resizeEvent(self, event):
+        self.layout_bars()
+        super().resizeEvent(event)
+
     def paintEvent(self, event):
         """Draw the audio visualizer"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        width = self.width()
+        if self.background is None:
+            self.build_background()
+        ratio = self.background.devicePixelRatio()
+        brush = self.ACTIVE_BRUSH if self.active else self.INACTIVE_BRUSH
         height = self.height()
-        
-        # Calculate bar width and spacing
-        num_bars = len(self.levels)
-        bar_width = (width - (num_bars - 1) * 2) / num_bars
-        
-        # Draw the visualization bars
-        for i, level in enumerate(self.levels):
-            # Map level to height
-            bar_height = (level / 100) * height
-            
-            # Set color based on active state
-            if self.active:
-                color = QColor(139, 92, 246)  # Purple for active
-            else:
-                color = QColor(100, 100, 100)  # Gray for inactive
-            
-            painter.setPen(Qt.NoPen)
-            painter.setBrush(color)
-            
-            x = i * (bar_width + 2)
-            y = height - bar_height
-            
-            painter.drawRoundedRect(int(x), int(y), int(bar_width), int(bar_height), 2, 2)
+        region = event.region()
+        bounds = region.boundingRect()
+        painter = QPainter(self)
+        painter.setClipRegion(region)
+        painter.drawPixmap(QRectF(bounds), self.background,
+                           QRectF(bounds.x() * ratio, bounds.y() * ratio,
+                                  bounds.width() * ratio, bounds.height() * ratio))
+
+        # Only the bars inside the exposed area, each once even if Qt split the region
+        exposed = np.zeros(self.bars, bool)
+        for rect in region.rects():
+            first = np.searchsorted(self.bar_right, rect.left(), side="right")
+            last = np.searchsorted(self.bar_left, rect.right(), side="right")
+            exposed[first:last] = True
+        for index in np.flatnonzero(exposed & (self.heights > 0)):
+            left = int(self.bar_left[index])
+            bar_height = int(self.heights[index])
+            painter.fillRect(left, height - bar_height, int(self.bar_right[index]) - left,
+                             bar_height, brush)
+        self.bars_painted += int(np.count_nonzero(exposed))
+        painter.end()
 
 
 class VoiceCommandView(BaseView):
     """View for the voice command functionality"""
     
+    # Most entries kept in the command history list
+    MAX_HISTORY = 100
+    
+    # Spectrum bands shown by the visualizer
+    VISUALIZER_BARS = 32
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.is_listening = False
-        self.visualizer_timer = QTimer()
-        self.visualizer_timer.timeout.connect(self.update_visualizer)
-        self.visualizer_levels = []
+        self.audio_engine = None
+        # Optional WAV path or AudioSource used instead of the microphone
+        self.audio_source = None
+        self.mic_sensitivity = 75
+        # Keep listening after each utterance instead of stopping
+        self.continuous_listening = False
+        # Offline recognizer for the command vocabulary; examples load on first use
+        self.keyword_spotter = KeywordSpotter()
+        # Recognition runs on worker threads so the GUI never waits for it
+        self.recognizer = RecognitionWorker(self.keyword_spotter, parent=self)
+        self.recognizer.recognized.connect(self.on_recognized)
+        self.recognizer.enrolled.connect(self.on_enrolled)
+        self.recognizer.dropped.connect(self.on_segments_dropped)
+        self.dropped_segments = 0
+        self.stats_timer = QTimer()
+        self.stats_timer.timeout.connect(self.update_stats)
+        # Maps recognized or typed text, aliases and macros to commands
+        self.command_matcher = CommandMatcher()
+        # Command whose example is being recorded, if any
+        self.training_command = None
         
     def setup_ui(self):
         """Set up the UI components"""
@@ -98,11 +249,13 @@ class VoiceCommandView(BaseView):
         status_layout.addWidget(status_label)
         status_layout.addWidget(self.status_indicator)
         status_layout.addStretch()
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("color: #888;")
+        status_layout.addWidget(self.stats_label)
         mic_layout.addLayout(status_layout)
         
         # Visualizer
-        self.visualizer = VoiceVisualizer()
-        self.visualizer.setStyleSheet("background-color: #1E212A; border-radius: 5px;")
+        self.visualizer = VoiceVisualizer(self.VISUALIZER_BARS)
         mic_layout.addWidget(self.visualizer)
         
         # Recognized text display
@@ -112,6 +265,10 @@ class VoiceCommandView(BaseView):
         self.text_display.setStyleSheet("background-color: #1E212A; border-radius: 5px; padding: 10px; min-height: 40px;")
         text_layout.addWidget(text_label)
         text_layout.addWidget(self.text_display)
+        self.text_input = QLineEdit()
+        self.text_input.setPlaceholderText("Or type a command and press Enter")
+        self.text_input.returnPressed.connect(self.submit_text)
+        text_layout.addWidget(self.text_input)
         mic_layout.addLayout(text_layout)
         
         # Microphone button
@@ -121,6 +278,14 @@ class VoiceCommandView(BaseView):
         self.toggle_button.clicked.connect(self.toggle_listening)
         button_layout.addStretch()
         button_layout.addWidget(self.toggle_button)
+        self.train_button = QPushButton("Train Command")
+        self.train_button.setMinimumHeight(40)
+        self.train_button.clicked.connect(self.toggle_training)
+        button_layout.addWidget(self.train_button)
+        self.alias_button = QPushButton("Aliases")
+        self.alias_button.setMinimumHeight(40)
+        self.alias_button.clicked.connect(self.edit_aliases)
+        button_layout.addWidget(self.alias_button)
         button_layout.addStretch()
         mic_layout.addLayout(button_layout)
         
@@ -131,7 +296,7 @@ class VoiceCommandView(BaseView):
         tips_layout = QVBoxLayout(tips_box)
         tips_title = QLabel("Voice Command Tips")
         tips_title.setStyleSheet("font-weight: bold;")
-        tips_text = QLabel("Try commands like \"Open Browser\", \"Volume Up\", \"Close Window\", or \"Scroll Down\" to control your system.")
+        tips_text = QLabel("Try commands like \"Open Browser\", \"Volume Up\", \"Close Window\", or \"Scroll Down\" to control your system. Use Train Command to record a few examples of each in your own voice first, and Aliases to add your own phrases or macros.")
         tips_text.setWordWrap(True)
         tips_layout.addWidget(tips_title)
         tips_layout.addWidget(tips_text)
@@ -178,6 +343,24 @@ class VoiceCommandView(BaseView):
                 item.setForeground(QColor(255, 0, 0))
             self.command_list.addItem(item)
 
+    def add_command(self, command, status="success", match=None):
+        """Add a recognized command to the top of the command history
+
+        match is an optional (matched command, score) pair kept with the entry.
+        """
+        item = QListWidgetItem(f"{time.strftime('%I:%M %p')} - {command}")
+        if match is not None:
+            item.setData(Qt.UserRole, match)
+        if status == "success":
+            item.setForeground(QColor(0, 200, 0))
+        else:
+            item.setForeground(QColor(255, 0, 0))
+        self.command_list.insertItem(0, item)
+        
+        # Keep the history bounded so adding an entry stays cheap
+        if self.command_list.count() > self.MAX_HISTORY:
+            self.command_list.takeItem(self.command_list.count() - 1)
+
     def toggle_listening(self):
         """Toggle voice recognition on/off"""
         self.is_listening = not self.is_listening
@@ -189,19 +372,221 @@ class VoiceCommandView(BaseView):
             self.status_indicator.setStyleSheet("color: #8B5CF6; font-weight: bold;")
             self.text_display.setText("Listening...")
             self.visualizer.setActive(True)
-            self.visualizer_timer.start(50)
+            
+            # The input is opened on the audio thread
+            self.audio_engine = AudioEngine(self.audio_source, self.visualizer.bars,
+                                            sensitivity=self.mic_sensitivity, parent=self)
+            self.audio_engine.opened.connect(self.on_audio_opened)
+            self.audio_engine.speech_started.connect(self.on_speech_started)
+            self.audio_engine.speech_segment.connect(self.on_speech_segment)
+            self.audio_engine.finished.connect(self.on_audio_finished)
+            self.audio_engine.finished.connect(self.audio_engine.deleteLater)
+            self.audio_engine.start()
+            self.visualizer.setLevelSource(self.audio_engine.levels)
         else:
-            # Stop listening
-            self.toggle_button.setText("Start Listening")
-            self.status_indicator.setText("Idle")
-            self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
-            self.text_display.setText("Click the microphone to start")
-            self.visualizer.setActive(False)
-            self.visualizer_timer.stop()
-    
-    def update_visualizer(self):
-        """Update the audio visualizer display"""
+            # Stop listening, dropping utterances that are still being recognized
+            self.recognizer.cancel()
+            self.stop_listening()
+    
+    def stop_listening(self):
+        """Stop the input and reset the UI; queued utterances are still recognized"""
+        self.is_listening = False
+        self.stop_audio()
+        if self.training_command is not None:
+            self.stop_training()
+        self.toggle_button.setText("Start Listening")
+        self.status_indicator.setText("Idle")
+        self.status_indicator.setStyleSheet("color: #888; font-weight: bold;")
+        self.text_display.setText("Click the microphone to start")
+        self.visualizer.setLevelSource(None)
+        self.visualizer.setActive(False)
+        self.visualizer.setLevels([5] * self.visualizer.bars)
+    
+    def on_audio_opened(self, ok):
+        """Stop again if the audio input could not be opened"""
+        if not ok and self.is_listening:
+            error = self.sender().source.error
+            self.toggle_listening()
+            self.text_display.setText(error)
+    
+    def on_audio_finished(self):
+        """Reset the UI if the input ended on its own (file played out, device lost)"""
+        if self.is_listening and self.sender() is self.audio_engine:
+            self.stop_listening()
+    
+    def on_speech_started(self):
+        """Show that the voice activity detector hears someone"""
         if self.is_listening:
-            # Generate random visualizer levels for demo
-            levels = np.random.randint(10, 70, 12).tolist()
-            self.visualizer.setLevels(levels)
+            self.status_indicator.setText("Hearing speech")
+    
+    def on_speech_segment(self, samples, features):
+        """Handle one utterance cut out by the voice activity detector"""
+        if not self.is_listening or self.audio_engine is None:
+            return
+        seconds = len(samples) / self.audio_engine.source.sample_rate
+        skipped = self.audio_engine.silence_ratio() * 100
+        self.text_display.setToolTip(f"Heard {seconds:.1f} s of speech ({skipped:.0f}% of input skipped as silence)")
+        self.status_indicator.setText("Listening")
+        if self.training_command is not None:
+            self.save_training(samples, features)
+        else:
+            self.recognize(samples, features)
+        if not self.continuous_listening:
+            self.stop_listening_after_utterance()
+    
+    def recognize(self, samples, features=None):
+        """Match an utterance against the command vocabulary and report the result"""
+        if not any(self.keyword_spotter.enrolled().values()):
+            self.text_display.setText("No commands trained yet - use Train Command")
+            return
+        self.recognizer.submit(samples, features)
+        self.text_display.setText("Recognizing...")
+    
+    def on_recognized(self, command, confidence, latency):
+        """Show a result from the recognition worker"""
+        if command is None:
+            self.text_display.setText(f"Not recognized ({latency:.0f} ms)")
+            self.add_command(f"Unrecognized ({confidence:.0%})", "error")
+            return
+        self.handle_text(command, f"{confidence:.0%} confidence, {latency:.0f} ms")
+    
+    def on_segments_dropped(self, count):
+        """Remember how many segments the recognizer had to drop, for the stats"""
+        self.dropped_segments = count
+    
+    def submit_text(self):
+        """Run the command typed into the text box"""
+        text = self.text_input.text().strip()
+        if text:
+            self.text_input.clear()
+            self.handle_text(text, "typed")
+    
+    def handle_text(self, text, detail):
+        """Map recognized text to a command and record the match in the history"""
+        command, score, _ = self.command_matcher.match(text)
+        if command is None:
+            self.text_display.setText(f"\"{text}\" - no matching command ({detail})")
+            self.add_command(f"\"{text}\" (no match, {score:.2f})", "error", (None, score))
+            return
+        self.text_display.setText(f"{command} ({detail})")
+        heard = command if text == command else f"\"{text}\" \u2192 {command}"
+        self.add_command(f"{heard} ({detail}, match {score:.2f})", match=(command, score))
+    
+    def edit_aliases(self):
+        """Add a user alias or macro, or remove one, and save the change"""
+        aliases = self.command_matcher.load()
+        phrases = sorted(aliases)
+        choices = ["Add alias..."] + [f"{phrase} \u2192 {aliases[phrase]}" for phrase in phrases]
+        choice, ok = QInputDialog.getItem(self, "Aliases", "Add an alias, or pick one to remove:",
+                                          choices, 0, False)
+        if not ok:
+            return
+        if choice != choices[0]:
+            phrase = phrases[choices.index(choice) - 1]
+            self.command_matcher.remove_alias(phrase)
+            message = f"Removed alias \"{phrase}\""
+        else:
+            phrase, ok = QInputDialog.getText(self, "Add Alias", "Phrase:")
+            if not ok or not phrase.strip():
+                return
+            # Any name that is not a built-in command makes the phrase a macro
+            command, ok = QInputDialog.getItem(self, "Add Alias", f"\"{phrase.strip()}\" runs:",
+                                               COMMANDS, 0, True)
+            if not ok or not command.strip():
+                return
+            self.command_matcher.add_alias(phrase, command.strip())
+            message = f"Added alias \"{phrase.strip()}\" \u2192 {command.strip()}"
+        try:
+            self.command_matcher.save()
+        except OSError:
+            self.add_command("Could not save aliases", "error")
+            return
+        self.add_command(message)
+    
+    def toggle_training(self):
+        """Record an example of a command, or cancel the recording"""
+        if self.training_command is not None:
+            self.stop_training()
+            self.add_command("Command training cancelled", "error")
+            return
+        command, ok = QInputDialog.getItem(self, "Train Command", "Command to record:",
+                                           COMMANDS, 0, False)
+        if not ok:
+            return
+        
+        self.training_command = command
+        self.train_button.setText("Cancel Training")
+        self.add_command(f"Training \"{command}\": say it once")
+        if not self.is_listening:
+            self.toggle_listening()
+        self.text_display.setText(f"Say \"{command}\"...")
+    
+    def save_training(self, samples, features=None):
+        """Store the utterance just heard as an example of the command being trained"""
+        self.recognizer.enroll(self.training_command, samples, features)
+        self.text_display.setText(f"Saving \"{self.training_command}\"...")
+        self.stop_training()
+    
+    def on_enrolled(self, command, count):
+        """Report an example saved by the recognition worker"""
+        if count < 0:
+            self.add_command(f"Could not save \"{command}\"", "error")
+            return
+        self.add_command(f"Saved example {count} of \"{command}\"")
+        self.text_display.setText(f"Recorded \"{command}\" ({count} example{'s' if count != 1 else ''})")
+    
+    def stop_training(self):
+        """Leave training mode"""
+        self.training_command = None
+        self.train_button.setText("Train Command")
+    
+    def stop_listening_after_utterance(self):
+        """Stop after one utterance, keeping what was heard on screen"""
+        text = self.text_display.text()
+        self.stop_listening()
+        self.text_display.setText(text)
+    
+    def set_mic_sensitivity(self, sensitivity):
+        """Apply the Microphone Sensitivity setting to speech detection"""
+        self.mic_sensitivity = sensitivity
+        if self.audio_engine:
+            self.audio_engine.set_sensitivity(sensitivity)
+    
+    def set_continuous_listening(self, enabled):
+        """Apply the Continuous Listening setting; enabling it starts listening"""
+        self.continuous_listening = enabled
+        if enabled and not self.is_listening:
+            self.toggle_listening()
+    
+    def stop_audio(self):
+        """Stop the audio thread and release the input"""
+        if self.audio_engine:
+            engine = self.audio_engine
+            self.audio_engine = None
+            engine.stop()
+    
+    def set_audio_source(self, source):
+        """Listen to a WAV file or AudioSource instead of the microphone; None restores it"""
+        self.audio_source = source
+    
+    def set_view_active(self, active):
+        """Only animate the visualizer while the view is on screen"""
+        super().set_view_active(active)
+        self.visualizer.setRendering(active)
+        if active:
+            self.stats_timer.start(1000)
+        else:
+            self.stats_timer.stop()
+    
+    def update_stats(self):
+        """Show the recognition queue depth, dropped segments and how busy the workers are"""
+        if self.recognizer.threads:
+            self.stats_label.setText(f"Queue {self.recognizer.depth()} \u00b7 "
+                                     f"Dropped {self.dropped_segments} \u00b7 "
+                                     f"Workers {self.recognizer.utilization():.0%} busy")
+    
+    def closeEvent(self, event):
+        """Release the audio input and the recognition workers when the view closes"""
+        self.stop_audio()
+        self.recognizer.stop()
+        super().closeEvent(event)